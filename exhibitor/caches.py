@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Versioned JSON files that let re-runs skip work
+
+The image info cache, the spelling cache and the derivative manifest are
+each a JSON object with a "version" key. They only save time, so a file
+that is missing or written by an incompatible version is not an error:
+it is ignored and the work is simply done again.
+"""
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def read_versioned_json(path, version, description):
+    """
+    Return the JSON object in the file at path, or None if there is no such
+    file or its version is not version. description (e.g. "image cache")
+    names the file in the warning logged when it is ignored.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            j = json.load(f)
+    except FileNotFoundError:
+        return None
+    if j.get('version') != version:
+        logger.warning(
+            'Ignoring {} {} with unsupported version'.format(
+                description, path))
+        return None
+    return j
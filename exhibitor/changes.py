@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detect which objects changed between pipeline runs
+
+Each object gets a content digest: the SHA-256 of the canonical JSON of its
+values for a fixed list of fields (or, for items already in their final
+form, such as json4plone's, of the whole item). Digests of the same values
+are the same in any run, on any machine, whichever format the data was
+dumped in, so comparing the digests of two versions of a collection gives
+the ids that were added, changed and removed. A digest manifest saves just
+the digests of a run, to compare the next one against.
+"""
+
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+DIGEST_MANIFEST_VERSION = 1
+
+
+def content_digest(value):
+    """Return the SHA-256 of the canonical JSON of value."""
+    return hashlib.sha256(
+        json.dumps(
+            value, ensure_ascii=False, separators=(',', ':'),
+            sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+def object_digest(datum, fields):
+    """Return the content digest of datum's values for fields."""
+    return content_digest([datum.get(field) for field in fields])
+
+
+class Delta(object):
+    """
+    Ids added, changed and removed since a previous version of a
+    collection (each sorted), and how many were unchanged.
+    """
+
+    def __init__(self, added, changed, removed, unchanged):
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+        self.unchanged = unchanged
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+    def __repr__(self):
+        return '<{} added={} changed={} removed={} unchanged={}>'.format(
+            type(self).__name__, len(self.added), len(self.changed),
+            len(self.removed), self.unchanged)
+
+    def as_dict(self):
+        return {
+            'added': self.added,
+            'changed': self.changed,
+            'removed': self.removed,
+            'unchanged': self.unchanged
+        }
+
+    def updated_ids(self):
+        """Ids whose objects are new or different."""
+        return sorted(self.added + self.changed)
+
+
+def compare_digests(current, previous):
+    """Return the Delta between two mappings of object id to digest."""
+    added = []
+    changed = []
+    unchanged = 0
+    for obj_id, digest in current.items():
+        try:
+            previous_digest = previous[obj_id]
+        except KeyError:
+            added.append(obj_id)
+            continue
+        if digest == previous_digest:
+            unchanged += 1
+        else:
+            changed.append(obj_id)
+    removed = [obj_id for obj_id in previous if obj_id not in current]
+    return Delta(sorted(added), sorted(changed), sorted(removed), unchanged)
+
+
+def read_digests(path, fields=None):
+    """
+    Read the digests in a manifest written by write_digests(). fields are
+    those the digests should cover (None for digests of whole items). A
+    manifest covering anything else holds a different kind of digest, keyed
+    differently, and raises RuntimeError.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        j = json.load(f)
+    if j.get('version') != DIGEST_MANIFEST_VERSION:
+        raise RuntimeError(
+            'Unsupported digest manifest version in {}'.format(path))
+    if j['fields'] != (None if fields is None else list(fields)):
+        if fields is None:
+            msg = (
+                'Digests in {} are of collection objects, not whole items'
+                ''.format(path))
+        elif j['fields'] is None:
+            msg = (
+                'Digests in {} are of whole items, not collection objects'
+                ''.format(path))
+        else:
+            msg = (
+                'Digests in {} cover different fields than the current '
+                'ones'.format(path))
+        raise RuntimeError(msg)
+    return j['digests']
+
+
+def write_digests(f, digests, fields=None):
+    """Write a digest manifest to the text stream f."""
+    json.dump(
+        {
+            'version': DIGEST_MANIFEST_VERSION,
+            'fields': None if fields is None else list(fields),
+            'digests': digests
+        },
+        f, ensure_ascii=False, indent=4, sort_keys=True)
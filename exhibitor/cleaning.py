@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Normalization of raw field values, serially or across processes
+"""
+
+from exhibitor.pools import run_in_pool
+from functools import lru_cache, partial
+from itertools import islice
+import logging
+import sys
+import textnorm
+
+logger = logging.getLogger(__name__)
+VALUE_CACHE_SIZE = 8192
+
+
+def clean_value(raw_value):
+    """Normalize space and Unicode form; empty values become None."""
+    v = raw_value
+    if v is not None:
+        v = textnorm.normalize_space(v)
+        v = textnorm.normalize_unicode(v, 'NFC')
+        if v in ['', ' ']:
+            v = None
+    return v
+
+
+def make_value_cleaner(maxsize=VALUE_CACHE_SIZE):
+    """
+    Return a memoized version of clean_value() backed by an LRU cache of
+    maxsize entries. Cleaned strings are interned, so a value repeated
+    across many objects is normalized once and stored once. Hit and miss
+    counts are available from the cache_info() method of the result.
+    """
+    @lru_cache(maxsize=maxsize)
+    def cached_clean_value(raw_value):
+        v = clean_value(raw_value)
+        if v is not None:
+            v = sys.intern(v)
+        return v
+    return cached_clean_value
+
+
+# shared by all objects (and, per process, by clean_rows workers)
+cached_clean_value = make_value_cleaner()
+
+
+def clean_row(row, verbatim=('id',)):
+    """
+    Clean every value in a row, a dictionary or a list. Keys (or, for
+    lists, positions) in verbatim are passed through untouched; by default
+    that is "id", which ExhibitionObject also takes as-is.
+    """
+    if isinstance(row, dict):
+        return {
+            k: v if k in verbatim else cached_clean_value(v)
+            for k, v in row.items()}
+    return [
+        v if i in verbatim else cached_clean_value(v)
+        for i, v in enumerate(row)]
+
+
+def clean_rows(rows, workers=None, batch_size=500, verbatim=('id',)):
+    """
+    Yield cleaned copies of rows (see clean_row), in their original order.
+
+    With workers > 1, rows are cut into batches of batch_size that are
+    cleaned in a pool of that many processes. Only a few batches per worker
+    are in flight at once, so rows can still be streamed from a file. With
+    workers None or 1 everything happens in this process. Either way,
+    repeated values come back as one shared string: strings interned by a
+    worker arrive here as fresh copies, so they are interned again.
+    """
+    if workers is None or workers <= 1:
+        for row in rows:
+            yield clean_row(row, verbatim)
+        return
+    rows = iter(rows)
+    batches = iter(lambda: list(islice(rows, batch_size)), [])
+    results = run_in_pool(
+        partial(_clean_batch, verbatim=verbatim), batches, workers)
+    for batch in results:
+        yield from _intern_batch(batch, verbatim)
+
+
+def _clean_batch(batch, verbatim):
+    return [clean_row(row, verbatim) for row in batch]
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_batch(batch, verbatim):
+    # unpickled strings are never interned, even if they were in the worker
+    for row in batch:
+        if isinstance(row, dict):
+            yield {
+                sys.intern(k): v if k in verbatim else _intern(v)
+                for k, v in row.items()}
+        else:
+            yield [
+                v if i in verbatim else _intern(v)
+                for i, v in enumerate(row)]
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resized web derivatives of exhibition images
+
+A DerivativeMaker writes one copy of each master image per configured size,
+scaled to fit that size's bounding box, into a subdirectory named after the
+size (e.g. large/ishtar_1.jpg). Images are processed in a pool of worker
+processes. Outputs that are already up to date are skipped, judged either by
+modification time or, with check='hash', by a manifest of the source
+checksum and box each output was made from. Every image gets a
+DerivativeResult with its timing.
+
+Resizing needs Pillow (pip install exhibitor[derivatives]); it is imported
+only when an image actually has to be resized.
+"""
+
+from collections import namedtuple
+from exhibitor.caches import read_versioned_json
+from exhibitor.pools import run_in_pool
+from functools import partial
+import hashlib
+import json
+import logging
+import os
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+DERIVATIVE_MANIFEST = 'derivatives.json'
+DERIVATIVE_MANIFEST_VERSION = 1
+DerivativeSize = namedtuple('DerivativeSize', ['name', 'width', 'height'])
+DEFAULT_SIZES = (
+    DerivativeSize('large', 768, 768),
+    DerivativeSize('preview', 400, 400),
+    DerivativeSize('thumb', 128, 128)
+)
+DerivativeResult = namedtuple(
+    'DerivativeResult',
+    ['obj_id', 'source', 'made', 'skipped', 'sha256', 'seconds'])
+
+
+def file_digest(path, chunk_size=1 << 20):
+    checksum = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def render_derivatives(source, targets, quality=85):
+    """
+    Write a resized copy of source for each (destination, (width, height))
+    in targets, keeping the aspect ratio. The master is decoded once.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError(
+            'Making derivatives requires Pillow: '
+            'pip install exhibitor[derivatives]')
+    with Image.open(source) as master:
+        master.load()
+        for dest, box in targets:
+            im = master.copy()
+            im.thumbnail(box, Image.LANCZOS)
+            if dest.lower().endswith(('.jpg', '.jpeg')):
+                if im.mode not in ('RGB', 'L'):
+                    im = im.convert('RGB')
+                im.save(dest, quality=quality, optimize=True)
+            else:
+                im.save(dest, optimize=True)
+
+
+class DerivativeMaker(object):
+    """
+    Makes derivatives of the sizes given under output_path. render is the
+    function that does the resizing (see render_derivatives); it must be a
+    module-level function so that worker processes can use it.
+    """
+
+    def __init__(
+        self, output_path, sizes=DEFAULT_SIZES, check='mtime', workers=None,
+        quality=85, render=render_derivatives
+    ):
+        if check not in ('mtime', 'hash'):
+            raise ValueError(
+                'Derivatives can be checked by "mtime" or "hash", not "{}"'
+                ''.format(check))
+        self.output_path = output_path
+        self.sizes = tuple(DerivativeSize(*size) for size in sizes)
+        self.check = check
+        self.workers = workers
+        self.quality = quality
+        self.render = render
+        self.made = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+        self.manifest_path = os.path.join(output_path, DERIVATIVE_MANIFEST)
+
+    def make(self, images):
+        """
+        Make derivatives for (obj_id, source path) pairs, yielding a
+        DerivativeResult for each in order.
+        """
+        self.made = 0
+        self.skipped = 0
+        start = perf_counter()
+        for size in self.sizes:
+            os.makedirs(
+                os.path.join(self.output_path, size.name), exist_ok=True)
+        manifest = self._load_manifest() if self.check == 'hash' else {}
+        jobs = (
+            self._job(obj_id, source, manifest) for obj_id, source in images)
+        try:
+            for result in self._run(jobs):
+                self.made += len(result.made)
+                self.skipped += len(result.skipped)
+                if result.sha256 is not None:
+                    name = os.path.basename(result.source)
+                    for size in self.sizes:
+                        manifest[size.name + '/' + name] = [
+                            result.sha256, size.width, size.height]
+                logger.debug(
+                    'Derivatives of {} in {:.3f}s: made {}, skipped {}'.format(
+                        result.source, result.seconds, result.made,
+                        result.skipped))
+                yield result
+        finally:
+            if self.check == 'hash':
+                self._save_manifest(manifest)
+            self.elapsed = perf_counter() - start
+            logger.info(
+                'Made {} derivatives ({} up to date) in {:.3f}s'.format(
+                    self.made, self.skipped, self.elapsed))
+
+    def _job(self, obj_id, source, manifest):
+        name = os.path.basename(source)
+        targets = []
+        for size in self.sizes:
+            dest = os.path.join(self.output_path, size.name, name)
+            recorded = manifest.get(size.name + '/' + name)
+            targets.append((size, dest, recorded))
+        return (obj_id, source, targets, self.check)
+
+    def _run(self, jobs):
+        make_one = partial(_make_one, render=self.render, quality=self.quality)
+        if self.workers is None or self.workers <= 1:
+            return map(make_one, jobs)
+        return run_in_pool(make_one, jobs, self.workers)
+
+    def _load_manifest(self):
+        j = read_versioned_json(
+            self.manifest_path, DERIVATIVE_MANIFEST_VERSION,
+            'derivative manifest')
+        return {} if j is None else j['outputs']
+
+    def _save_manifest(self, manifest):
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'version': DERIVATIVE_MANIFEST_VERSION, 'outputs': manifest},
+                f, ensure_ascii=False, indent=4, sort_keys=True)
+
+
+def _make_one(job, render, quality):
+    # runs in a worker process: check the outputs, then make the stale ones
+    start = perf_counter()
+    obj_id, source, targets, check = job
+    sha256 = None
+    if check == 'hash':
+        sha256 = file_digest(source)
+        source_mtime = None
+    else:
+        source_mtime = os.stat(source).st_mtime_ns
+    stale = []
+    skipped = []
+    for size, dest, recorded in targets:
+        try:
+            dest_mtime = os.stat(dest).st_mtime_ns
+        except FileNotFoundError:
+            stale.append((size, dest))
+            continue
+        if check == 'hash':
+            current = recorded == [sha256, size.width, size.height]
+        else:
+            current = dest_mtime >= source_mtime
+        if current:
+            skipped.append(size.name)
+        else:
+            stale.append((size, dest))
+    if stale:
+        render(
+            source,
+            [(dest, (size.width, size.height)) for size, dest in stale],
+            quality)
+    return DerivativeResult(
+        obj_id, source, [size.name for size, dest in stale], skipped, sha256,
+        perf_counter() - start)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lazily loaded fixup tables for exhibitions
+
+An exhibition's hand-made corrections (titles, slugs, summaries, permitted
+words) live as JSON objects keyed by object id (or word) in a directory of
+data files, one file per table. A FixupStore hands out FixupTables for that
+directory; a table reads and indexes its file the first time it is used, so
+importing an exhibition module costs nothing however large the tables grow,
+and a script that needs one table never parses the others.
+"""
+
+from collections import namedtuple
+from collections.abc import Mapping
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+DATA_PATH = Path(__file__).parent / 'data'
+Drift = namedtuple('Drift', ['obj_id', 'field', 'expected', 'found'])
+
+
+class FixupTable(Mapping):
+    """
+    Read-only mapping backed by a JSON data file, read on first access.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._data = None
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return '<{} {} ({})>'.format(
+            type(self).__name__, self.path,
+            'loaded' if self.loaded else 'not loaded')
+
+    def keys(self):
+        return self.data.keys()
+
+    @property
+    def data(self):
+        if self._data is None:
+            self.load()
+        return self._data
+
+    @property
+    def loaded(self):
+        return self._data is not None
+
+    def load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise RuntimeError(
+                'Fixup table {} must hold a JSON object, not {}'
+                ''.format(self.path, type(data).__name__))
+        logger.debug(
+            'Loaded {} fixups from {}'.format(len(data), self.path))
+        self._data = data
+
+
+class FixupReport(object):
+    """
+    What applying a fixup table did: ids of objects that were fixed, Drift
+    records for objects whose current values were not what the table
+    expected (these are left alone) and ids in the table that match no
+    object.
+    """
+
+    def __init__(self):
+        self.applied = []
+        self.drift = []
+        self.unmatched = []
+
+    def __repr__(self):
+        return '<{} applied={} drift={} unmatched={}>'.format(
+            type(self).__name__, len(self.applied), len(self.drift),
+            len(self.unmatched))
+
+    def drifted_ids(self):
+        return [d.obj_id for d in self.drift]
+
+
+class FixupStore(object):
+    """
+    The fixup tables of one exhibition: store['titles'] is the table in
+    titles.json under path. Tables are created on demand and shared.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.tables = {}
+
+    def __contains__(self, name):
+        return self._table_path(name).is_file()
+
+    def __getitem__(self, name):
+        try:
+            return self.tables[name]
+        except KeyError:
+            pass
+        path = self._table_path(name)
+        if not path.is_file():
+            raise KeyError(name)
+        table = FixupTable(path)
+        self.tables[name] = table
+        return table
+
+    def names(self):
+        return sorted(p.stem for p in self.path.glob('*.json'))
+
+    def _table_path(self, name):
+        return self.path / '{}.json'.format(name)
+
+
+def exhibition_fixups(exhibition):
+    """Return the FixupStore for an exhibition's packaged data files."""
+    return FixupStore(DATA_PATH / exhibition)
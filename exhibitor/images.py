@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Find exhibition images on disk
+
+Image files are named <prefix>_<object id>.<extension>. ImageScanner walks
+an image directory with os.scandir (one system call per directory, with file
+types coming back from the same call), optionally descending into
+subdirectories and optionally scanning directories in a thread pool, which
+pays off on networked file systems where each listing waits on the server.
+Matches are yielded as soon as their directory has been read.
+
+read_image_info gets the format and pixel dimensions of a JPEG or PNG file
+from its header, without decoding the image, along with its size and
+SHA-256 checksum. inspect_images does the same for many files in a thread
+pool, logging files it can't read rather than stopping, and an
+ImageInfoCache lets repeat runs skip files whose size and modification time
+have not changed.
+"""
+
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from exhibitor.caches import read_versioned_json
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import re
+import struct
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+IMAGE_CACHE_VERSION = 1
+CHECKSUM_CHUNK_SIZE = 1 << 20
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# start-of-frame markers carry the dimensions; C4, C8 and CC share the
+# range but are something else
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+rx_image_filename = re.compile(
+    r'^(?P<prefix>[a-z_]+)_(?P<id>[a-z\d]+)\.(?P<extension>jpg|png)$'
+)
+ImageMatch = namedtuple('ImageMatch', ['obj_id', 'name', 'path'])
+ImageInfo = namedtuple(
+    'ImageInfo', ['format', 'width', 'height', 'size', 'sha256'])
+
+
+class ImageScanner(object):
+    """
+    Scan root for image files whose names match pattern. Each match is an
+    ImageMatch: the object id, the file's path relative to root (just the
+    file name unless recursive) and its full path. After a scan, the
+    directories, files, matched and elapsed attributes describe it.
+    """
+
+    def __init__(
+        self, root, recursive=False, workers=None,
+        pattern=rx_image_filename
+    ):
+        self.root = Path(root)
+        self.recursive = recursive
+        self.workers = workers
+        self.pattern = pattern
+        self.directories = 0
+        self.files = 0
+        self.matched = 0
+        self.elapsed = 0.0
+
+    def __iter__(self):
+        return self.scan()
+
+    def scan(self):
+        self.directories = 0
+        self.files = 0
+        self.matched = 0
+        start = perf_counter()
+        if self.recursive and self.workers is not None and self.workers > 1:
+            listings = self._walk_threaded()
+        else:
+            listings = self._walk()
+        try:
+            for matches, subdirs, files in listings:
+                self.directories += 1
+                self.files += files
+                self.matched += len(matches)
+                yield from matches
+        finally:
+            self.elapsed = perf_counter() - start
+            logger.info(
+                'Scanned {} files in {} directories under {} in {:.3f}s; '
+                '{} matched'.format(
+                    self.files, self.directories, self.root, self.elapsed,
+                    self.matched))
+
+    def _walk(self):
+        stack = [(str(self.root), '')]
+        while stack:
+            listing = self._scan_dir(*stack.pop())
+            stack.extend(reversed(listing[1]))
+            yield listing
+
+    def _walk_threaded(self):
+        with ThreadPoolExecutor(self.workers) as pool:
+            pending = {pool.submit(self._scan_dir, str(self.root), '')}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    listing = future.result()
+                    for subdir in listing[1]:
+                        pending.add(pool.submit(self._scan_dir, *subdir))
+                    yield listing
+
+    def _scan_dir(self, path, relative):
+        """Return (matches, subdirectories to scan, number of files)."""
+        matches = []
+        subdirs = []
+        files = 0
+        with os.scandir(path) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                name = entry.name
+                if entry.is_file():
+                    files += 1
+                    m = self.pattern.match(name)
+                    if m is not None:
+                        matches.append(ImageMatch(
+                            m.group('id'), relative + name, entry.path))
+                elif self.recursive and entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, relative + name + '/'))
+        return (matches, subdirs, files)
+
+
+class AltTextReport(object):
+    """
+    What joining alt text to a collection did: ids of objects given alt
+    text, alt text ids that match no object, ids of objects that have alt
+    text but no image and ids of objects that have an image but no alt
+    text.
+    """
+
+    def __init__(self):
+        self.applied = []
+        self.unmatched = []
+        self.no_image = []
+        self.missing_alt = []
+
+    def __repr__(self):
+        return (
+            '<{} applied={} unmatched={} no_image={} missing_alt={}>'
+            ''.format(
+                type(self).__name__, len(self.applied), len(self.unmatched),
+                len(self.no_image), len(self.missing_alt)))
+
+
+def read_image_info(path):
+    """Return the ImageInfo for a JPEG or PNG file."""
+    with open(path, 'rb') as f:
+        start = f.read(len(PNG_SIGNATURE))
+        if start == PNG_SIGNATURE:
+            image_format = 'png'
+            width, height = _png_dimensions(f)
+        elif start[:2] == b'\xff\xd8':
+            image_format = 'jpeg'
+            width, height = _jpeg_dimensions(f)
+        else:
+            raise RuntimeError(
+                '{} is not a JPEG or PNG image'.format(path))
+        f.seek(0)
+        size = 0
+        checksum = hashlib.sha256()
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b''):
+            size += len(chunk)
+            checksum.update(chunk)
+    return ImageInfo(image_format, width, height, size, checksum.hexdigest())
+
+
+def _png_dimensions(f):
+    chunk = f.read(16)
+    if len(chunk) < 16 or chunk[4:8] != b'IHDR':
+        raise RuntimeError('PNG image {} has no IHDR chunk'.format(f.name))
+    return struct.unpack('>II', chunk[8:16])
+
+
+def _jpeg_dimensions(f):
+    f.seek(2)
+    while True:
+        b = f.read(1)
+        while b and b != b'\xff':
+            b = f.read(1)
+        while b == b'\xff':
+            b = f.read(1)
+        if not b:
+            break
+        marker = b[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # standalone markers have no length
+            continue
+        if marker in (0xD9, 0xDA):
+            # end of image, or start of scan: no frame header before pixels
+            break
+        length = f.read(2)
+        if len(length) < 2:
+            break
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                break
+            precision, height, width = struct.unpack('>BHH', frame)
+            return (width, height)
+        f.seek(struct.unpack('>H', length)[0] - 2, os.SEEK_CUR)
+    raise RuntimeError('JPEG image {} has no frame header'.format(f.name))
+
+
+class ImageInfoCache(object):
+    """
+    ImageInfo of earlier inspections, keyed by file path and kept along
+    with the file's size and modification time. An entry is used only
+    while both still match; after an inspection the cache holds exactly
+    the files inspected.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        if path is not None:
+            j = read_versioned_json(path, IMAGE_CACHE_VERSION, 'image cache')
+            if j is not None:
+                self.entries = j['entries']
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, path, stat):
+        """Return the cached ImageInfo for path if it is still current."""
+        try:
+            mtime_ns, size, info = self.entries[os.path.abspath(path)]
+        except KeyError:
+            return None
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            return None
+        return ImageInfo(*info)
+
+    def put(self, path, stat, info):
+        self.entries[os.path.abspath(path)] = [
+            stat.st_mtime_ns, stat.st_size, list(info)]
+
+    def save(self, path=None):
+        if path is None:
+            path = self.path
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'version': IMAGE_CACHE_VERSION, 'entries': self.entries},
+                f, ensure_ascii=False)
+
+
+def inspect_images(paths, workers=None, cache=None):
+    """
+    Yield (path, ImageInfo) for each of paths, in order. With workers > 1,
+    files are read by a pool of that many threads. If an ImageInfoCache is
+    given, unchanged files are not read at all and the cache is updated.
+    A file that can't be read, or isn't a JPEG or PNG image, is logged and
+    yielded with None for its ImageInfo; it does not stop the others.
+    """
+    def inspect(path):
+        try:
+            stat = os.stat(path)  # stat in the pool: slow on network mounts
+            info = None if cache is None else cache.get(path, stat)
+            if info is not None:
+                return (path, stat, info, True, None)
+            return (path, stat, read_image_info(path), False, None)
+        except (OSError, RuntimeError) as err:
+            return (path, None, None, False, err)
+
+    start = perf_counter()
+    hits = 0
+    failed = 0
+    seen = {}
+    if workers is None or workers <= 1:
+        pool = None
+        results = map(inspect, paths)
+    else:
+        pool = ThreadPoolExecutor(workers)
+        results = pool.map(inspect, paths)
+    try:
+        for path, stat, info, cached, err in results:
+            if err is not None:
+                failed += 1
+                logger.error(
+                    'Could not inspect image {}: {}'.format(path, err))
+            else:
+                if cached:
+                    hits += 1
+                seen[str(path)] = (stat, info)
+            yield (path, info)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if cache is not None:
+        cache.entries = {}
+        for path, (stat, info) in seen.items():
+            cache.put(path, stat, info)
+    logger.info(
+        'Inspected {} images in {:.3f}s ({} from cache, {} failed)'.format(
+            len(seen), perf_counter() - start, hits, failed))
@@ -4,18 +4,32 @@
 Exhibition Objects and Collections of Same
 """
 
+import chardet
+import codecs
+from collections.abc import Mapping, MutableMapping
 from copy import deepcopy
-from encoded_csv import get_csv
+import csv
+from exhibitor.changes import (
+    compare_digests, object_digest, read_digests, write_digests)
+from exhibitor.cleaning import cached_clean_value, clean_rows
+from exhibitor.derivatives import (
+    DEFAULT_SIZES, DerivativeMaker, render_derivatives)
+from exhibitor.fixups import Drift, FixupReport
+from exhibitor.images import (
+    AltTextReport, ImageScanner, inspect_images, rx_image_filename)
+from exhibitor.slugs import SlugAllocator, SlugRules
+from exhibitor.summaries import (
+    DEFAULT_SUMMARY_TEMPLATE, summary_artist, summary_inventory_num,
+    summary_title)
+from exhibitor.snapshot import ColumnarSnapshot, write_snapshot
 import json
 import logging
-import re
-from slugify import slugify
+import msgpack
+import os
+import sys
 import textnorm
 import uuid
 
-rx_image_filename = re.compile(
-    r'^(?P<prefix>[a-z_]+)_(?P<id>[a-z\d]+)\.(?P<extension>jpg|png)$'
-)
 # exhibition object fields are defined at:
 # github.com/isawnyu/isaw.web:
 #    /src/isaw.exhibitions/isaw/exhibitions/interfaces/__init__.py
@@ -60,9 +74,434 @@ required_fields = [
     'title',
     'inventory_num'
 ]
+# fixed schema shared by all objects: each field gets one slot (the repeats
+# at the end of "fields" above keep their first position)
+field_schema = tuple(dict.fromkeys(fields))
+field_slots = {field: i for i, field in enumerate(field_schema)}
+file_types = {
+    '.csv': 'csv',
+    '.digests': 'digests',
+    '.json': 'json',
+    '.msgpack': 'msgpack',
+    '.snapshot': 'snapshot',
+}
+MSGPACK_VERSION = 1
+NUMBER_CHARS = frozenset('0123456789+-.eE')
 logger = logging.getLogger(__name__)
 
 
+def iter_csv(
+    csv_file, encoding='', dialect='', sample_lines=100, positional=False
+):
+    """
+    Lazily read rows from an encoded CSV file as dictionaries.
+
+    Encoding and dialect detection follow encoded_csv.get_csv(), but rows
+    are yielded one at a time instead of being gathered into a list, so
+    memory use stays flat no matter how large the file is. If positional is
+    True, rows are yielded as lists instead, the first being the header.
+    Blank lines are skipped either way.
+    """
+    rpath = os.path.realpath(csv_file)
+    if encoding == '':
+        with open(rpath, 'rb') as f:
+            raw = f.read(1024)
+        if raw.startswith(codecs.BOM_UTF8):
+            file_encoding = 'utf-8-sig'
+        else:
+            file_encoding = chardet.detect(raw)['encoding']
+    else:
+        file_encoding = encoding
+    with open(rpath, 'r', encoding=file_encoding) as f:
+        if dialect == '':
+            sample = ''.join([f.readline() for _ in range(sample_lines)])
+            csv_dialect = csv.Sniffer().sniff(sample)
+            f.seek(0)
+        else:
+            csv_dialect = dialect
+        if positional:
+            # csv.reader gives [] for blank lines; DictReader skips them
+            for row in csv.reader(f, dialect=csv_dialect):
+                if row:
+                    yield row
+        else:
+            yield from csv.DictReader(f, dialect=csv_dialect)
+
+
+def iter_json(json_file, chunk_size=65536):
+    """
+    Lazily read the members of a JSON file whose top level is an object,
+    yielding (key, value) pairs as they are parsed.
+
+    The file is read in chunks of chunk_size characters and only the
+    member being decoded is held in memory, so the intermediate files
+    exchanged between pipeline steps can be processed in bounded memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(json_file, 'r', encoding='utf-8') as f:
+        buf = ''
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if chunk == '':
+                eof = True
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        def skip_space():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\n\r':
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                fill()
+
+        def expect(chars):
+            nonlocal pos
+            skip_space()
+            if pos == len(buf) or buf[pos] not in chars:
+                raise json.JSONDecodeError(
+                    'Expecting one of {!r}'.format(chars), buf, pos)
+            pos += 1
+            return buf[pos - 1]
+
+        def decode():
+            nonlocal pos
+            skip_space()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    # a number can run past the end of the buffer, and a
+                    # prefix of one ("12" of "12.5e3") parses on its own;
+                    # valid JSON never has these characters after a value
+                    if eof or (
+                        end < len(buf) and buf[end] not in NUMBER_CHARS
+                    ):
+                        pos = end
+                        return value
+                fill()
+
+        expect('{')
+        skip_space()
+        if pos < len(buf) and buf[pos] == '}':
+            return
+        while True:
+            key = decode()
+            expect(':')
+            yield (key, decode())
+            if expect(',}') == '}':
+                return
+
+
+def guess_file_type(path, default='json'):
+    """Guess a load/dump file_type from a path's suffix."""
+    return file_types.get(os.path.splitext(str(path))[1].lower(), default)
+
+
+def iter_dump(path, file_type=None):
+    """
+    Lazily read (obj_id, datum) pairs from a dumped collection, guessing
+    file_type from the path's suffix if it is not given.
+    """
+    if file_type is None:
+        file_type = guess_file_type(path)
+    if file_type == 'json':
+        return iter_json(path)
+    elif file_type == 'msgpack':
+        return iter_msgpack(path)
+    elif file_type == 'snapshot':
+        return _iter_snapshot(path)
+    raise NotImplementedError(
+        'Reading dumped objects from a file of type "{}" is unsupported.'
+        ''.format(file_type))
+
+
+def dump_digests(path, file_type=None):
+    """
+    Return the content digests (see exhibitor.changes) of the objects in a
+    dumped collection, by object id. A digest manifest (file_type
+    'digests') is read as is.
+    """
+    if file_type is None:
+        file_type = guess_file_type(path)
+    if file_type == 'digests':
+        return read_digests(path, field_schema)
+    return {
+        obj_id: object_digest(datum, field_schema)
+        for obj_id, datum in iter_dump(path, file_type)}
+
+
+def iter_msgpack(msgpack_file):
+    """
+    Lazily read objects from a collection dumped with file_type='msgpack',
+    yielding (obj_id, datum) pairs like iter_json().
+
+    The file starts with a header naming the fields in use when it was
+    written; each following record is [values in that field order, extra
+    fields or None].
+    """
+    records = _iter_msgpack_records(msgpack_file)
+    header_fields = next(records)
+    for values, extra in records:
+        datum = dict(zip(header_fields, values))
+        if extra is not None:
+            datum.update(extra)
+        yield (datum['id'], datum)
+
+
+def _iter_snapshot(path):
+    with ColumnarSnapshot(path) as snapshot:
+        yield from snapshot.items()
+
+
+def _iter_msgpack_records(msgpack_file):
+    # yields the header's field list, then each [values, extra] record
+    with open(msgpack_file, 'rb') as f:
+        unpacker = msgpack.Unpacker(f, raw=False)
+        try:
+            header = next(unpacker)
+        except StopIteration:
+            raise ValueError(
+                '{} is not an exhibitor msgpack file'.format(msgpack_file))
+        if not isinstance(header, dict) or 'exhibitor' not in header:
+            raise ValueError(
+                '{} is not an exhibitor msgpack file'.format(msgpack_file))
+        if header['exhibitor'] != MSGPACK_VERSION:
+            raise ValueError(
+                'Unsupported exhibitor msgpack version {} in {}'
+                ''.format(header['exhibitor'], msgpack_file))
+        yield header['fields']
+        yield from unpacker
+
+
+def _format_ids(ids, limit=10):
+    # for messages about any number of objects
+    shown = ', '.join('"{}"'.format(i) for i in ids[:limit])
+    if len(ids) > limit:
+        shown += ' and {} more'.format(len(ids) - limit)
+    return shown
+
+
+class _SnapshotRows(object):
+    # write_snapshot reads the rows once per column; rather than copying the
+    # whole collection into rows up front, each pass walks the objects in id
+    # order and hands out views of their data
+    def __init__(self, objects, fields):
+        self.objects = objects
+        self.fields = fields
+        self.ids = sorted(objects)
+
+    def __iter__(self):
+        for obj_id in self.ids:
+            yield _SnapshotRow(self.objects[obj_id].data, self.fields)
+
+
+class _SnapshotRow(object):
+    __slots__ = ('data', 'fields')
+
+    def __init__(self, data, fields):
+        self.data = data
+        self.fields = fields
+
+    def __getitem__(self, position):
+        return self.data.get(self.fields[position])
+
+
+class ObjectData(MutableMapping):
+    """
+    Dict-compatible storage for the field values of one exhibition object.
+
+    Values live in a list laid out according to the shared field_schema, so
+    objects don't each carry their own copy of every key. Unset fields are
+    None and cost a single pointer. Every schema field is always present;
+    deleting one resets it to None. Keys outside the schema (e.g. from a
+    custom crosswalk) go to an overflow dict that is only created when used.
+
+    An object held in a collection is attached to it, and the collection
+    is told of every change before it is made, which is how it keeps its
+    field indices current (and can refuse the change). The owner is not
+    carried over to copies.
+    """
+
+    __slots__ = ('_values', '_extra', '_owner')
+
+    def __init__(self, data=None):
+        self._values = [None] * len(field_schema)
+        self._extra = None
+        self._owner = None
+        if data is not None:
+            self.update(data)
+
+    def __getitem__(self, key):
+        try:
+            return self._values[field_slots[key]]
+        except KeyError:
+            if self._extra is None:
+                raise
+            return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if self._owner is not None:
+            old_value = self.get(key)
+            if old_value != value:
+                self._owner._reindex(self, key, old_value, value)
+        try:
+            self._values[field_slots[key]] = value
+        except KeyError:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in field_slots:
+            self[key] = None
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            old_value = self._extra[key]
+            if self._owner is not None and old_value is not None:
+                self._owner._reindex(self, key, old_value, None)
+            del self._extra[key]
+
+    def __iter__(self):
+        yield from field_schema
+        if self._extra is not None:
+            yield from list(self._extra)
+
+    def __len__(self):
+        if self._extra is None:
+            return len(field_schema)
+        return len(field_schema) + len(self._extra)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self.items()))
+
+    def __getstate__(self):
+        return (self._values, self._extra)
+
+    def __setstate__(self, state):
+        self._values, self._extra = state
+        self._owner = None
+
+    @property
+    def owner(self):
+        return self._owner
+
+    def attach(self, owner):
+        if self._owner is not None and self._owner is not owner:
+            raise RuntimeError(
+                'Object data with id "{}" already belongs to a collection'
+                ''.format(self.get('id')))
+        self._owner = owner
+
+    def detach(self, owner):
+        if self._owner is owner:
+            self._owner = None
+
+
+def _indexable(value):
+    if value is None:
+        return False
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class FieldIndex(object):
+    """
+    Secondary index from the values of one field to the ids of the objects
+    that have them. Values are indexed both as-is and case-folded; None and
+    unhashable values (such as lists) are not indexed.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.exact = {}
+        self.folded = {}
+
+    def add(self, obj_id, value):
+        if not _indexable(value):
+            return
+        self.exact.setdefault(value, {})[obj_id] = None
+        if isinstance(value, str):
+            self.folded.setdefault(value.casefold(), {})[obj_id] = None
+
+    def remove(self, obj_id, value):
+        if not _indexable(value):
+            return
+        self._discard(self.exact, value, obj_id)
+        if isinstance(value, str):
+            self._discard(self.folded, value.casefold(), obj_id)
+
+    def get(self, value, casefold=False):
+        if casefold:
+            try:
+                ids = self.folded[value.casefold()]
+            except (AttributeError, KeyError):
+                return []
+        else:
+            try:
+                ids = self.exact[value]
+            except KeyError:
+                return []
+        return list(ids)
+
+    def _discard(self, table, key, obj_id):
+        try:
+            ids = table[key]
+        except KeyError:
+            return
+        ids.pop(obj_id, None)
+        if len(ids) == 0:
+            del table[key]
+
+
+class CrosswalkPlan(object):
+    """
+    A crosswalk compiled against one CSV header row.
+
+    Each column is resolved up front to the schema slot (or, for fields
+    outside the schema, the key) it fills, and headers the crosswalk does not
+    know are reported before any row is read. Rows can then be turned into
+    objects by position with ExhibitionObject.from_row(). A column headed
+    "id" is the object's internal id, as with dictionaries.
+    """
+
+    def __init__(self, header, crosswalk=None):
+        self.header = list(header)
+        self.id_position = None
+        self.columns = []
+        unknown = []
+        for position, name in enumerate(self.header):
+            if name == 'id':
+                self.id_position = position
+                continue
+            if crosswalk is None:
+                field = name if name in field_slots else None
+            else:
+                field = crosswalk.get(name)
+            if field is None:
+                unknown.append(name)
+            else:
+                self.columns.append(
+                    (position, field_slots.get(field), field))
+        if len(unknown) > 0:
+            raise ValueError(
+                'Crosswalk has no field for column(s): {}'
+                ''.format(', '.join(repr(name) for name in unknown))
+            )
+
+
 class ExhibitionObject(object):
     """
     Information about a single item (or group of items) in an exhibition.
@@ -70,7 +509,9 @@ class ExhibitionObject(object):
     the ISAW website.
     """
 
-    def __init__(self, obj_data, obj_id=None, crosswalk=None):
+    __slots__ = ('data',)
+
+    def __init__(self, obj_data, obj_id=None, crosswalk=None, clean=True):
         valid = False
         for valid_type in [dict]:
             if isinstance(obj_data, valid_type):
@@ -80,9 +521,7 @@ class ExhibitionObject(object):
             msg = 'Unable to adapt object data of type {}'.format(
                 type(obj_data))
             raise ValueError(msg)
-        self.data = {}
-        for field in fields:
-            self.data[field] = None
+        self.data = ObjectData()
         try:
             internal_id = obj_data['id']
         except KeyError:
@@ -103,7 +542,33 @@ class ExhibitionObject(object):
                     raise RuntimeError(msg)
         self.data['id'] = this_id
         self._adapt(
-            {k: v for k, v in obj_data.items() if k != 'id'}, crosswalk)
+            {k: v for k, v in obj_data.items() if k != 'id'}, crosswalk,
+            clean)
+
+    @classmethod
+    def from_row(cls, row, plan, clean=True):
+        """
+        Make an object from a list of CSV values according to a
+        CrosswalkPlan. Missing trailing values count as None and surplus
+        values are ignored.
+        """
+        obj = cls.__new__(cls)
+        obj.data = data = ObjectData()
+        values = data._values
+        width = len(row)
+        if plan.id_position is not None and plan.id_position < width:
+            values[field_slots['id']] = row[plan.id_position]
+        else:
+            values[field_slots['id']] = str(uuid.uuid4())
+        for position, slot, field in plan.columns:
+            v = row[position] if position < width else None
+            if clean:
+                v = cached_clean_value(v)
+            if slot is None:
+                data[field] = v
+            else:
+                values[slot] = v
+        return obj
 
     def merge(self, other_obj, delimiter='; '):
         merged = {}
@@ -128,45 +593,50 @@ class ExhibitionObject(object):
         merged['id'] = str(uuid.uuid4())
         return ExhibitionObject(merged)
 
-    def _adapt(self, obj_data, crosswalk):
-        if crosswalk is None:
-            xwalk = {}
-            for k in self.data.keys():
-                if k != 'id':
-                    xwalk[k] = k
-        else:
-            xwalk = crosswalk
+    def _adapt(self, obj_data, crosswalk, clean=True):
         for k, v in obj_data.items():
             if k != 'id':
-                self.data[xwalk[k]] = self._clean_value(v)
+                if crosswalk is None:
+                    if k not in field_slots:
+                        raise KeyError(k)
+                    field = k
+                else:
+                    field = crosswalk[k]
+                if clean:
+                    v = self._clean_value(v)
+                self.data[field] = v
 
     def _clean_value(self, raw_value):
-        v = raw_value
-        if v is not None:
-            v = textnorm.normalize_space(v)
-            v = textnorm.normalize_unicode(v, 'NFC')
-            if v in ['', ' ']:
-                v = None
-        return v
+        return cached_clean_value(raw_value)
 
 
 class ObjectCollection(object):
 
+    # fields for which indices are maintained from the start; others can be
+    # added later with add_index()
+    indexed_fields = [
+        'title', 'lender', 'inventory_num', 'object_location', 'slug']
+    slug_rules = SlugRules()
+    summary_template = DEFAULT_SUMMARY_TEMPLATE
+
     def __init__(self, crosswalk=None):
         self.objects = {}
         self.indices = {}
-        self.slugs = {}
+        self.slugs = SlugAllocator()
         self.crosswalk = crosswalk
+        self.plans = {}
+        for field in self.indexed_fields:
+            self.indices[field] = FieldIndex(field)
 
     def __len__(self):
         return len(self.objects)
 
-    def add(self, obj_data, obj_id=None, merge=False):
-        this_id, this_obj = self._make_object(obj_data, obj_id)
+    def add(self, obj_data, obj_id=None, merge=False, clean=True):
+        this_id, this_obj = self._make_object(obj_data, obj_id, clean)
         try:
             self.objects[this_id]
         except KeyError:
-            self.objects[this_id] = this_obj
+            self._put(this_id, this_obj)
         else:
             if merge:
                 logger.warning(
@@ -175,7 +645,7 @@ class ObjectCollection(object):
                 )
                 merged_obj = self.objects[this_id].merge(this_obj)
                 merged_obj.data['id'] = this_id
-                self.objects[this_id] = merged_obj
+                self._put(this_id, merged_obj)
             else:
                 msg = (
                     'ID collision in object addition: there is already a key '
@@ -183,35 +653,116 @@ class ObjectCollection(object):
                     ''.format(this_id)
                 )
                 raise RuntimeError(msg)
+
+    def add_index(self, field):
+        """Start maintaining an index for another field."""
         try:
-            del self.indices['title']
+            return self.indices[field]
         except KeyError:
-            pass
+            index = FieldIndex(field)
+            for obj_id, obj in self.objects.items():
+                index.add(obj_id, obj.data.get(field))
+            self.indices[field] = index
+            return index
 
-    def add_images(self, images_path, alt_text_path, fail_on_mismatch=True):
-        file_paths = list(images_path.glob('*_*'))
-        image_info = [
-            (rx_image_filename.match(fp.name), fp) for fp in file_paths]
-        image_info = [t for t in image_info if t[0] is not None]
-        for i, ident in enumerate([t[0].group('id') for t in image_info]):
+    def add_images(
+        self, images_path, alt_text_path, fail_on_mismatch=True,
+        recursive=False, workers=None
+    ):
+        """
+        Set the image of each object with an image file in images_path
+        (and, if recursive, its subdirectories, scanned by up to workers
+        threads). Returns the ImageScanner, which has timings for the scan.
+        """
+        scanner = ImageScanner(images_path, recursive, workers)
+        for match in scanner.scan():
             try:
-                o = self.objects[ident]
+                o = self.objects[match.obj_id]
             except KeyError:
                 msg = (
                     'Image {} failed to match any objects'
-                    ''.format(image_info[i][1].absolute())
+                    ''.format(os.path.abspath(match.path))
                 )
                 if fail_on_mismatch:
                     raise RuntimeError(msg)
                 else:
                     logger.error(msg)
             else:
-                o.data['image'] = image_info[i][1].name
+                o.data['image'] = match.name
         if alt_text_path is not None:
-            self._add_alt_text(alt_text_path)
+            self._add_alt_text(alt_text_path, fail_on_image_missing=False)
+        return scanner
+
+    def apply_fixups(self, fixups, field=None, expect=None):
+        """
+        Apply a table of fixups (a mapping of object id to fixup) by joining
+        it against the collection's ids, and return a FixupReport.
+
+        With field, each fixup is the new value of that field. Otherwise
+        each fixup is a dict of new field values, in which None means leave
+        the field alone and a value naming another key of the same fixup
+        stands for that key's value. expect maps fields to the fixup key
+        holding the value the field must have for the fixup to apply;
+        objects that differ are reported as drift instead.
+        """
+        expect = {} if expect is None else expect
+        checked_keys = set(expect.values())
+        report = FixupReport()
+        objects = self.objects
+        for obj_id in fixups.keys():
+            try:
+                data = objects[obj_id].data
+            except KeyError:
+                report.unmatched.append(obj_id)
+                continue
+            fixup = fixups[obj_id]
+            drift = [
+                Drift(obj_id, f, fixup[k], data[f])
+                for f, k in expect.items() if data[f] != fixup[k]]
+            if drift:
+                report.drift.extend(drift)
+                continue
+            if field is not None:
+                data[field] = fixup
+            else:
+                for k, v in fixup.items():
+                    if v is None or k in checked_keys:
+                        continue
+                    if isinstance(v, str) and v in fixup:
+                        v = fixup[v]
+                    data[k] = v
+            report.applied.append(obj_id)
+        return report
+
+    def compile_crosswalk(self, header):
+        """Return the CrosswalkPlan for a header row, compiling it once."""
+        header = tuple(header)
+        try:
+            return self.plans[header]
+        except KeyError:
+            plan = CrosswalkPlan(header, self.crosswalk)
+            self.plans[header] = plan
+            return plan
+
+    def delta(self, previous, file_type=None):
+        """
+        Return the Delta (ids added, changed and removed) between a
+        previous version of the collection and this one. previous is a
+        mapping of object ids to digests or the path of a dump or digest
+        manifest (see dump_digests).
+        """
+        if not isinstance(previous, Mapping):
+            previous = dump_digests(previous, file_type)
+        return compare_digests(self.digests(), previous)
+
+    def digests(self):
+        """Return the content digest of each object, by id."""
+        return {
+            obj_id: object_digest(obj.data, field_schema)
+            for obj_id, obj in self.objects.items()}
 
     def dump(self, file_path=None, file_type='json'):
-        valid_types = ['json']
+        valid_types = ['json', 'msgpack', 'snapshot', 'digests']
         if file_type not in valid_types:
             raise NotImplementedError(
                 'Dumping an object collection to a file of type "{}" '
@@ -227,25 +778,35 @@ class ObjectCollection(object):
                 self,
                 '_dump_file_{}'.format(file_type))(file_path)
 
-    def get_by_title(self, title):
-        try:
-            self.indices['title']
-        except KeyError:
-            self.indices['title'] = {}
-            for obj_id, obj in self.objects.items():
-                try:
-                    self.indices['title'][obj.data['title']]
-                except KeyError:
-                    self.indices['title'][obj.data['title']] = [obj_id]
-                else:
-                    self.indices['title'][obj.data['title']].append(obj_id)
-        try:
-            return self.indices['title'][title]
-        except KeyError:
-            return []
+    def get_by(self, field, value, casefold=False):
+        """Return ids of objects whose field has value (optionally ignoring
+        case)."""
+        return self.add_index(field).get(value, casefold)
+
+    def get_by_title(self, title, casefold=False):
+        return self.get_by('title', title, casefold)
 
-    def load(self, path, file_type='csv', merge=False):
-        valid_types = ['csv', 'json']
+    def inspect_images(self, images_path, workers=None, cache=None):
+        """
+        Read the format, dimensions, size and checksum of each object's
+        image (as set by add_images) from the files under images_path.
+        Returns a dictionary mapping object ids to ImageInfo; images that
+        could not be inspected are logged and left out. See
+        exhibitor.images.inspect_images for workers and cache.
+        """
+        with_images = [
+            (obj_id, obj.data['image']) for obj_id, obj in self.objects.items()
+            if obj.data['image'] is not None]
+        paths = [
+            os.path.join(images_path, name) for obj_id, name in with_images]
+        # the inspection goes first in zip so that it runs to completion
+        return {
+            obj_id: info for (path, info), (obj_id, name) in zip(
+                inspect_images(paths, workers, cache), with_images)
+            if info is not None}
+
+    def load(self, path, file_type='csv', merge=False, workers=None):
+        valid_types = ['csv', 'json', 'msgpack', 'snapshot']
         if file_type not in valid_types:
             raise NotImplementedError(
                 'Loading an object collection from a file of type "{}" '
@@ -253,95 +814,204 @@ class ObjectCollection(object):
                 ''.format(file_type, valid_types)
             )
         elif file_type == 'csv':
-            data = get_csv(path, sample_lines=1000)
-            for datum in data['content']:
-                self.add(datum, merge=merge)
+            rows = iter_csv(path, sample_lines=1000, positional=True)
+            try:
+                plan = self.compile_crosswalk(next(rows))
+            except StopIteration:
+                return
+            clean = True
+            if workers is not None:
+                rows = clean_rows(rows, workers, verbatim=[plan.id_position])
+                clean = False
+            for row in rows:
+                self.add(
+                    ExhibitionObject.from_row(row, plan, clean), merge=merge)
         elif file_type == 'json':
-            with open(path, 'r', encoding='utf8') as f:
-                j = json.load(f)
-            del f
-            for datum_id, datum in j.items():
+            for datum_id, datum in iter_json(path):
                 self.add(datum, obj_id=datum_id, merge=merge)
+        elif file_type == 'msgpack':
+            records = _iter_msgpack_records(path)
+            plan = CrosswalkPlan(next(records))
+            for values, extra in records:
+                obj = ExhibitionObject.from_row(values, plan, clean=False)
+                if extra is not None:
+                    obj.data.update(extra)
+                self.add(obj, merge=merge)
+        elif file_type == 'snapshot':
+            with ColumnarSnapshot(path) as snapshot:
+                schema_fields = [
+                    f for f in snapshot.fields if f in field_slots]
+                extra_fields = [
+                    f for f in snapshot.fields if f not in field_slots]
+                plan = CrosswalkPlan(schema_fields)
+                for i in range(len(snapshot)):
+                    obj = ExhibitionObject.from_row(
+                        [snapshot.value(i, f) for f in schema_fields], plan,
+                        clean=False)
+                    for f in extra_fields:
+                        v = snapshot.value(i, f)
+                        if v is not None:
+                            obj.data[f] = v
+                    self.add(obj, merge=merge)
+
+    def make_derivatives(
+        self, images_path, output_path, sizes=DEFAULT_SIZES, check='mtime',
+        workers=None, render=render_derivatives
+    ):
+        """
+        Make resized derivatives of each object's image (as set by
+        add_images) under output_path, skipping those that are up to date.
+        Returns a list of DerivativeResult, one per image. See
+        exhibitor.derivatives.DerivativeMaker for the other arguments.
+        """
+        maker = DerivativeMaker(
+            output_path, sizes, check, workers, render=render)
+        images = [
+            (obj_id, os.path.join(images_path, obj.data['image']))
+            for obj_id, obj in self.objects.items()
+            if obj.data['image'] is not None]
+        return list(maker.make(images))
 
     def make_slugs(self):
-        for obj_id, obj in self.objects.items():
+        """
+        Give every object a unique slug. Fixed slugs from _set_slug() are
+        reserved first, so generated slugs never take them; repeats get
+        suffixes from a fresh SlugAllocator, so re-running gives the same
+        result.
+        """
+        self.slugs = SlugAllocator()
+        fixed = {}
+        for obj_id in self.objects:
             slug = self._set_slug(obj_id)
-            if slug is None:
-                slug = obj.data['title']
-                for punct in [':', '(', '.', ';', ',']:
-                    if punct in slug:
-                        slug = slug.split(punct)[0].strip()
-                slug = textnorm.normalize_space(slug)
-                words = slug.split()
-                for skip in ['of', 'with', 'from']:
-                    try:
-                        idx = words.index(skip)
-                    except ValueError:
-                        continue
-                    else:
-                        del words[idx]
-                slug = ' '.join(words)
-                slug = slugify(slug, only_ascii=True)
+            if slug is not None:
+                fixed[obj_id] = self.slugs.allocate(slug)
+                if fixed[obj_id] != slug:
+                    logger.warning(
+                        'Fixed slug "{}" for ID = "{}" is already taken; '
+                        'using "{}"'.format(slug, obj_id, fixed[obj_id]))
+        for obj_id, obj in self.objects.items():
             try:
-                self.slugs[slug]
+                slug = fixed[obj_id]
             except KeyError:
-                self.slugs[slug] = 1
-            else:
-                suffix = chr(self.slugs[slug] + 96)
-                self.slugs[slug] += 1
-                slug += '-{}'.format(suffix)
+                slug = self.slugs.allocate(
+                    self.slug_rules.make(obj.data['title']))
             obj.data['slug'] = slug
 
     def make_summaries(self, exhibition_blurb=None):
-        for obj_id, obj in self.objects.items():
-            summary = self._set_summary(obj, exhibition_blurb)
-            if summary is None:
-                raise RuntimeError('Disastrous fail')
-            else:
-                obj.data['summary'] = summary
+        """
+        Set every object's summary with _set_summary, which by default
+        renders the collection's summary_template.
+        """
+        for obj in self.objects.values():
+            obj.data['summary'] = self._set_summary(obj, exhibition_blurb)
+
+    def remove(self, obj_id):
+        """Remove an object, and its index entries, returning it."""
+        obj = self.objects.pop(obj_id)
+        obj.data.detach(self)
+        for field, index in self.indices.items():
+            index.remove(obj_id, obj.data.get(field))
+        return obj
 
     def _add_alt_text(
-        self, alt_text_path, fail_on_image_missing=True, 
+        self, alt_text_path, fail_on_image_missing=True,
         fail_on_mismatch=True
     ):
-        data = get_csv(alt_text_path, encoding='utf-8-sig', dialect='excel')
-        for datum in data['content']:
+        """
+        Join the alt text in a CSV file (columns "oid" and "alt") to the
+        collection, reading the file a row at a time, and return an
+        AltTextReport. Alt text matching no object, and (if
+        fail_on_image_missing) alt text for objects without images, raises
+        one RuntimeError naming all such ids; otherwise it is logged.
+        """
+        report = AltTextReport()
+        objects = self.objects
+        for datum in iter_csv(
+            alt_text_path, encoding='utf-8-sig', dialect='excel'
+        ):
             try:
-                o = self.objects[datum['oid']]
+                o = objects[datum['oid']]
             except KeyError:
-                msg = (
-                    'Alt text for {} failed to match any objects'
-                    ''.format(datum['oid'])
-                )
-                if fail_on_mismatch:
+                report.unmatched.append(datum['oid'])
+                continue
+            v = textnorm.normalize_space(datum['alt'])
+            v = textnorm.normalize_unicode(v, 'NFC')
+            if v != '':
+                o.data['alt'] = v
+                report.applied.append(datum['oid'])
+        for obj_id, o in objects.items():
+            has_image = o.data['image'] is not None
+            has_alt = o.data['alt'] is not None
+            if has_alt and not has_image:
+                report.no_image.append(obj_id)
+            elif has_image and not has_alt:
+                report.missing_alt.append(obj_id)
+        for fail, ids, msg in [
+            (
+                fail_on_mismatch, report.unmatched,
+                'Alt text for {} failed to match any objects'),
+            (
+                fail_on_image_missing, report.no_image,
+                'Alt text for {} belongs to objects without images')
+        ]:
+            if ids:
+                msg = msg.format(_format_ids(ids))
+                if fail:
                     raise RuntimeError(msg)
                 else:
                     logger.error(msg)
-            else:
-                v = textnorm.normalize_space(datum['alt'])
-                v = textnorm.normalize_unicode(v, 'NFC')
-                if v != '':
-                    o.data['alt'] = v
+        if report.missing_alt:
+            logger.warning(
+                'No alt text for images of {}'.format(
+                    _format_ids(report.missing_alt)))
+        return report
+
+    def _put(self, obj_id, obj):
+        try:
+            old_obj = self.objects[obj_id]
+        except KeyError:
+            pass
+        else:
+            if old_obj is not obj:
+                self.remove(obj_id)
+        obj.data.attach(self)
+        self.objects[obj_id] = obj
+        for field, index in self.indices.items():
+            index.add(obj_id, obj.data.get(field))
+
+    def _reindex(self, data, key, old_value, new_value):
+        # called by an attached ObjectData before it changes a value
+        if key == 'id':
+            self._rekey(data, old_value, new_value)
+            return
+        try:
+            index = self.indices[key]
+        except KeyError:
+            return
+        obj_id = data['id']
+        index.remove(obj_id, old_value)
+        index.add(obj_id, new_value)
+
+    def _rekey(self, data, old_id, new_id):
+        if new_id is None:
+            raise RuntimeError(
+                'Objects in a collection need an id: cannot unset that of '
+                '"{}"'.format(old_id))
+        if new_id in self.objects:
+            raise RuntimeError(
+                'ID collision in object id change: there is already a key '
+                'with value "{}"'.format(new_id))
+        obj = self.objects.pop(old_id)
+        self.objects[new_id] = obj
+        for field, index in self.indices.items():
+            index.remove(old_id, old_id if field == 'id' else data.get(field))
+            index.add(new_id, new_id if field == 'id' else data.get(field))
 
     def _make_summary_artist(self, obj, suppress_unknown=True):
-        artist = obj.data['artist']
-        if artist is not None:
-            if not suppress_unknown or 'unknown' not in artist.lower():
-                return artist
-        return None
+        return summary_artist(obj.data, suppress_unknown)
 
     def _make_summary_inventory_num(self, obj, suppress_unknown=True):
-        invno = obj.data['inventory_num']
-        if invno is not None:
-            if (
-                not suppress_unknown or
-                (
-                    'unknown' not in invno and
-                    invno != 'N/A'
-                )
-            ):
-                return invno
-        return None
+        return summary_inventory_num(obj.data, suppress_unknown)
 
     def _make_summary_lender(self, obj):
         return obj.data['lender']
@@ -350,75 +1020,108 @@ class ObjectCollection(object):
         return obj.data['object_location']
 
     def _make_summary_title(self, obj, include_detail=False):
-        title_types = ['full_title', 'title']
-        if include_detail:
-            title_types = ['title_detail'] + title_types
-        for fullest in title_types:
-            if obj.data[fullest] is not None:
-                return obj.data[fullest]
-        raise RuntimeError(
-            'No valid titles in object {}'.format(obj.data['id'])
-        )
+        return summary_title(obj.data, include_detail)
+
+    def _dump_file_digests(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            write_digests(f, self.digests(), field_schema)
+
+    def _dump_stdio_digests(self):
+        write_digests(sys.stdout, self.digests(), field_schema)
+        sys.stdout.write('\n')
 
     def _dump_file_json(self, file_path):
-        d = self._make_dump_dict()
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(
-                d,
-                f,
+            self._write_json(f)
+
+    def _dump_stdio_json(self):
+        self._write_json(sys.stdout)
+        sys.stdout.write('\n')
+
+    def _write_json(self, f):
+        """
+        Write the collection to a text stream one object at a time, in
+        sorted id order. The result is exactly what json.dump() with
+        indent=4 and sort_keys=True would give for _make_dump_dict(), without
+        holding the whole document in memory.
+        """
+        if len(self.objects) == 0:
+            f.write('{}')
+            return
+        separator = '{\n    '
+        for obj_id in sorted(self.objects):
+            f.write(separator)
+            f.write(json.dumps(obj_id, ensure_ascii=False))
+            f.write(': ')
+            j = json.dumps(
+                dict(self.objects[obj_id].data),
                 ensure_ascii=False,
                 indent=4,
                 sort_keys=True
             )
+            f.write(j.replace('\n', '\n    '))
+            separator = ',\n    '
+        f.write('\n}')
 
-    def _dump_stdio_json(self):
-        d = self._make_dump_dict()
-        j = json.dumps(
-            d,
-            ensure_ascii=False,
-            indent=4,
-            sort_keys=True
-        )
-        print(j)
+    def _dump_file_msgpack(self, file_path):
+        with open(file_path, 'wb') as f:
+            self._write_msgpack(f)
+
+    def _dump_stdio_msgpack(self):
+        self._write_msgpack(sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+
+    def _write_msgpack(self, f):
+        """
+        Write the collection to a binary stream in compact msgpack form (see
+        iter_msgpack), one object at a time in sorted id order.
+        """
+        packer = msgpack.Packer()
+        f.write(packer.pack(
+            {'exhibitor': MSGPACK_VERSION, 'fields': list(field_schema)}))
+        for obj_id in sorted(self.objects):
+            data = self.objects[obj_id].data
+            f.write(packer.pack((data._values, data._extra)))
+
+    def _dump_file_snapshot(self, file_path):
+        extra_fields = set()
+        for obj in self.objects.values():
+            if obj.data._extra is not None:
+                extra_fields.update(obj.data._extra)
+        snapshot_fields = list(field_schema) + sorted(extra_fields)
+        write_snapshot(
+            file_path, snapshot_fields,
+            _SnapshotRows(self.objects, snapshot_fields))
+
+    def _dump_stdio_snapshot(self):
+        raise NotImplementedError(
+            'Snapshots are memory-mapped and must be dumped to a file.')
 
     def _make_dump_dict(self):
         d = {}
         for obj_id, obj in self.objects.items():
-            d[obj_id] = obj.data
+            d[obj_id] = dict(obj.data)
         return d
 
-    def _make_object(self, obj_data, obj_id):
+    def _make_object(self, obj_data, obj_id, clean=True):
         if isinstance(obj_data, ExhibitionObject):
-            if obj_id is None:
+            owner = obj_data.data.owner
+            if obj_id is None and (owner is None or owner is self):
                 return (obj_data.data['id'], obj_data)
             else:
+                # objects of another collection are copied, not shared
                 new_obj = deepcopy(obj_data)
-                new_obj.data['id'] = obj_id
-                return (obj_id, new_obj)
+                if obj_id is not None:
+                    new_obj.data['id'] = obj_id
+                return (new_obj.data['id'], new_obj)
         else:
-            o = ExhibitionObject(obj_data, obj_id, self.crosswalk)
+            o = ExhibitionObject(obj_data, obj_id, self.crosswalk, clean)
             return (o.data['id'], o)
 
     def _set_slug(self, obj_id):
         return None
 
     def _set_summary(self, obj, exhibition_blurb):
-        summary = ''
-        summary += self._make_summary_title(obj)
-        artist = self._make_summary_artist(obj)
-        if artist is not None:
-            summary += ' by {}'.format(artist)
-        ol = self._make_summary_location(obj)
-        if ol is not None:
-            summary += ' from {}'.format(ol)
-        summary += '. '
-        summary += 'Lent by {} (inventory number: {}).'.format(
-            obj._make_summary_lender(), 
-            obj._make_summary_inventory_number())
-        if exhibition_blurb is not None:
-            summary += ' {}'.format(exhibition_blurb)
-        if summary[-1] != '.':
-            summary += '.'
-        return summary
+        return self.summary_template.render(obj.data, exhibition_blurb)
 
 
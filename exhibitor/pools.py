@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ordered, bounded use of a process pool
+
+Cleaning, spell checking and derivative making all hand a stream of jobs
+to worker processes and consume the results in the order the jobs came.
+run_in_pool keeps only a few jobs per worker in flight, so the stream can
+be read lazily (e.g. rows from a file) without queueing all of it at once.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def run_in_pool(func, jobs, workers, initializer=None, initargs=()):
+    """
+    Yield func(job) for each of jobs, in order, computed in a pool of
+    workers processes, at most workers * 2 of them submitted at a time.
+    func must be picklable: a module-level function, or a
+    functools.partial of one. initializer and initargs are passed to the
+    pool, to set up each worker process.
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(func, job))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
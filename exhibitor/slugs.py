@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules for turning object titles into URL slugs
+"""
+
+from functools import lru_cache
+import logging
+import re
+from slugify import slugify
+
+logger = logging.getLogger(__name__)
+SLUGIFY_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=SLUGIFY_CACHE_SIZE)
+def cached_slugify(text, only_ascii=True):
+    return slugify(text, only_ascii=only_ascii)
+
+
+class SlugRules(object):
+    """
+    How an exhibition derives a slug from a title. The title is cut at the
+    first of the truncate_at characters, the first occurrence of each stop
+    word is dropped and the rest is slugified. Collections use the rules
+    in their slug_rules attribute, so an exhibition can substitute its own.
+    """
+
+    def __init__(
+        self, truncate_at=':(.;,', stop_words=('of', 'with', 'from'),
+        only_ascii=True
+    ):
+        self.truncate_at = truncate_at
+        self.stop_words = frozenset(stop_words)
+        self.only_ascii = only_ascii
+        self.rx_truncate = re.compile('[{}]'.format(re.escape(truncate_at)))
+
+    def make(self, title):
+        words = []
+        seen = set()
+        for word in self.rx_truncate.split(title, 1)[0].split():
+            if word in self.stop_words and word not in seen:
+                seen.add(word)
+            else:
+                words.append(word)
+        return cached_slugify(' '.join(words), self.only_ascii)
+
+
+def slug_suffix(n):
+    """
+    Suffix for the nth repeat of a slug: a, b, ... z, aa, ab, ... (bijective
+    base 26, so it never runs out of letters).
+    """
+    letters = ''
+    while n > 0:
+        n, r = divmod(n - 1, 26)
+        letters = chr(97 + r) + letters
+    return letters
+
+
+class SlugAllocator(object):
+    """
+    Hands out unique slugs. The first request for a slug gets it as-is;
+    repeats get "-a", "-b", ... appended, skipping any slug already taken.
+    A per-slug counter remembers where the last search stopped, so each
+    allocation costs O(1) however many repeats there are.
+    """
+
+    def __init__(self):
+        self.used = set()
+        self.counters = {}
+
+    def __contains__(self, slug):
+        return slug in self.used
+
+    def __len__(self):
+        return len(self.used)
+
+    def allocate(self, slug):
+        if slug not in self.used:
+            self.used.add(slug)
+            return slug
+        n = self.counters.get(slug, 0)
+        while True:
+            n += 1
+            candidate = '{}-{}'.format(slug, slug_suffix(n))
+            if candidate not in self.used:
+                break
+        self.counters[slug] = n
+        self.used.add(candidate)
+        return candidate
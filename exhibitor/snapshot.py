@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memory-mapped columnar snapshots of object collections
+
+A snapshot file holds one column per field. Each column is the UTF-8 text of
+its values laid end to end, an array of n + 1 offsets into that text and a
+null mask of n bytes. Rows are stored in sorted id order, so the "id" column
+doubles as the id index. A JSON header at the end of the file records where
+each column lives; the last 16 bytes are the header's position and a magic
+number. Readers map the file instead of parsing it, so opening is nearly
+instant and any number of processes can share the one copy in the OS page
+cache.
+"""
+
+from array import array
+import json
+import logging
+import mmap
+import sys
+
+logger = logging.getLogger(__name__)
+SNAPSHOT_MAGIC = b'EXHSNAP1'
+SNAPSHOT_VERSION = 1
+
+
+def write_snapshot(path, fields, rows):
+    """
+    Write a snapshot of rows (sequences of values in fields order, with an
+    "id" field among them) to path. Rows must already be sorted by id and
+    may be any re-iterable sequence, since each column is written in its own
+    pass.
+    """
+    id_position = fields.index('id')
+    count = 0
+    previous = None
+    for row in rows:
+        if previous is not None and row[id_position] <= previous:
+            raise ValueError(
+                'Snapshot rows must have unique ids in sorted order; '
+                'got "{}" after "{}"'.format(row[id_position], previous))
+        previous = row[id_position]
+        count += 1
+    columns = {}
+    with open(path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        for position, field in enumerate(fields):
+            offsets = array('Q', [0])
+            nulls = bytearray(count)
+            data_start = f.tell()
+            end = 0
+            for i, row in enumerate(rows):
+                v = row[position]
+                if v is None:
+                    nulls[i] = 1
+                elif isinstance(v, str):
+                    end += f.write(v.encode('utf-8'))
+                else:
+                    raise TypeError(
+                        'Snapshots hold text only; {} of "{}" is {}'
+                        ''.format(field, row[id_position], type(v)))
+                offsets.append(end)
+            _pad(f)
+            offsets_start = f.tell()
+            offsets.tofile(f)
+            nulls_start = f.tell()
+            f.write(nulls)
+            _pad(f)
+            columns[field] = [data_start, offsets_start, nulls_start]
+        header = {
+            'version': SNAPSHOT_VERSION,
+            'byteorder': sys.byteorder,
+            'count': count,
+            'fields': list(fields),
+            'columns': columns
+        }
+        header_start = f.tell()
+        f.write(json.dumps(header).encode('utf-8'))
+        f.write(array('Q', [header_start]).tobytes())
+        f.write(SNAPSHOT_MAGIC)
+
+
+def _pad(f):
+    # keep offset arrays 8-byte aligned
+    f.write(b'\x00' * (-f.tell() % 8))
+
+
+class ColumnarSnapshot(object):
+    """
+    Read-only, memory-mapped view of a snapshot file. Values are decoded
+    only when asked for; nothing is materialized up front.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mm = self._mm
+        if (
+            len(mm) < 2 * len(SNAPSHOT_MAGIC) + 8 or
+            mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or
+            mm[-len(SNAPSHOT_MAGIC):] != SNAPSHOT_MAGIC
+        ):
+            mm.close()
+            raise ValueError('{} is not an exhibitor snapshot'.format(path))
+        trailer = len(mm) - len(SNAPSHOT_MAGIC) - 8
+        header_start = array('Q', mm[trailer:trailer + 8])[0]
+        header = json.loads(mm[header_start:trailer].decode('utf-8'))
+        if (
+            header['version'] != SNAPSHOT_VERSION or
+            header['byteorder'] != sys.byteorder
+        ):
+            mm.close()
+            raise ValueError(
+                'Unsupported snapshot version or byte order in {}'
+                ''.format(path))
+        self.fields = header['fields']
+        self.count = header['count']
+        self._view = memoryview(mm)
+        self._columns = {}
+        for field, (data_start, offsets_start, nulls_start) in (
+            header['columns'].items()
+        ):
+            offsets = self._view[
+                offsets_start:offsets_start + 8 * (self.count + 1)].cast('Q')
+            nulls = self._view[nulls_start:nulls_start + self.count]
+            self._columns[field] = (data_start, offsets, nulls)
+        self._ids = self._columns['id']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, obj_id):
+        return self.find(obj_id) is not None
+
+    def __getitem__(self, obj_id):
+        i = self.find(obj_id)
+        if i is None:
+            raise KeyError(obj_id)
+        return self.row(i)
+
+    def close(self):
+        for data_start, offsets, nulls in self._columns.values():
+            offsets.release()
+            nulls.release()
+        self._columns = {}
+        self._view.release()
+        self._mm.close()
+
+    def column(self, field):
+        """Iterate over the values of one field in id order."""
+        for i in range(self.count):
+            yield self.value(i, field)
+
+    def find(self, obj_id):
+        """Return the row number of obj_id, or None (binary search)."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._value(self._ids, mid) < obj_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._value(self._ids, lo) == obj_id:
+            return lo
+        return None
+
+    def get(self, obj_id, field, default=None):
+        i = self.find(obj_id)
+        if i is None:
+            return default
+        return self.value(i, field)
+
+    def ids(self):
+        return self.column('id')
+
+    def items(self):
+        """Iterate over (obj_id, datum) pairs, like iter_dump()."""
+        for i in range(self.count):
+            datum = self.row(i)
+            yield (datum['id'], datum)
+
+    def row(self, i):
+        return {field: self.value(i, field) for field in self.fields}
+
+    def value(self, i, field):
+        return self._value(self._columns[field], i)
+
+    def _value(self, column, i):
+        data_start, offsets, nulls = column
+        if nulls[i]:
+            return None
+        return str(
+            self._mm[data_start + offsets[i]:data_start + offsets[i + 1]],
+            'utf-8')
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Spell checking for the text fields of exhibition objects
+"""
+
+from exhibitor.caches import read_versioned_json
+from exhibitor.pools import run_in_pool
+import hashlib
+from itertools import islice
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# characters treated as word separators in addition to whitespace
+PUNCTUATION = ',:-().&+/–_;[]"©'
+# fields holding identifiers, numbers and measurements, not prose
+SKIP_FIELDS = [
+    'slug', 'id', 'inventory_num', 'image', 'date', 'dimensions'
+]
+rx_item_number = re.compile(
+    r'^[0-9]+[a-z]+$'
+)
+rx_zero_padded = re.compile(
+    r'^0+[0-9]+$'
+)
+rx_alpha_number = re.compile(
+    r'^[a-z][0-9]+[a-z]?$'
+)
+punctuation_table = str.maketrans({c: ' ' for c in PUNCTUATION})
+SPELLING_CACHE_VERSION = 1
+
+
+def digest(value):
+    """Short content hash of a field value, for the spelling cache."""
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def rules_digest():
+    """Hash of the tokenizing and matching rules, for the spelling cache."""
+    rules = [PUNCTUATION] + [
+        rx.pattern for rx in [rx_item_number, rx_zero_padded, rx_alpha_number]]
+    return digest('\n'.join(rules))
+
+
+def load_words(path):
+    """Read a dictionary file with one word per line."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return {line.strip() for line in f}
+
+
+def tokenize(value):
+    """Split a field value into words at whitespace and PUNCTUATION."""
+    return value.translate(punctuation_table).split()
+
+
+class SpellChecker(object):
+    """
+    Checks field values against a dictionary of good words plus a list of
+    words permitted for a particular exhibition. Both are kept as sets, so
+    each lookup costs the same however large the dictionary grows.
+    """
+
+    def __init__(self, words=(), permitted=(), skip_fields=SKIP_FIELDS):
+        self.words = frozenset(words)
+        self.permitted = frozenset(permitted)
+        self.skip_fields = frozenset(skip_fields)
+        self._suggestions = None
+
+    @classmethod
+    def from_file(cls, path, permitted=(), skip_fields=SKIP_FIELDS):
+        return cls(load_words(path), permitted, skip_fields)
+
+    def check_collection(
+        self, collection, workers=None, batch_size=200, cache=None
+    ):
+        """Check every object in an ObjectCollection (see check_items)."""
+        return self.check_items(
+            ((obj_id, obj.data) for obj_id, obj
+             in collection.objects.items()),
+            workers, batch_size, cache)
+
+    def check_items(self, items, workers=None, batch_size=200, cache=None):
+        """
+        Check (obj_id, datum) pairs, such as those from iter_dump(). Returns
+        a dictionary mapping each unknown word (lower-cased) to the list of
+        (obj_id, field) loci where it occurs, in the order found.
+
+        With workers > 1, objects are checked in batches of batch_size in a
+        pool of that many processes. Batch results are merged in input
+        order, so the result is the same as for a serial run.
+
+        If a SpellingCache is given, only values that are not in it (or
+        whose cached result a dictionary change has made stale) are checked,
+        and the cache is updated to hold exactly the values seen.
+        """
+        if cache is not None:
+            return self._check_items_cached(
+                items, workers, batch_size, cache)
+        if workers is None or workers <= 1:
+            return self._check_batch(items)
+        items = iter(items)
+        batches = iter(
+            lambda: [
+                (obj_id, self._text_fields(datum))
+                for obj_id, datum in islice(items, batch_size)],
+            [])
+        words = {}
+        for batch_words in self._run_batches(batches, _check_batch, workers):
+            self._merge(words, batch_words)
+        return words
+
+    def check_value(self, value):
+        """Return the unknown words in value, lower-cased, in order."""
+        return self.classify_value(value)[0]
+
+    def classify_value(self, value):
+        """
+        Return the unknown words in value (lower-cased, in order) and the
+        sorted distinct words of value that are known because they are in
+        the dictionary or permitted words. Numbers and words matched by
+        pattern are in neither list.
+        """
+        unknown = []
+        known = set()
+        for token in tokenize(value):
+            if self._is_number(token):
+                continue
+            t = token.lower()
+            if t in self.permitted or t in self.words:
+                known.add(t)
+            elif not self.is_known(t):
+                unknown.append(t)
+        return (unknown, sorted(known))
+
+    def suggest(self, word, count=3):
+        """
+        Return up to count known words close to word (see SuggestionIndex).
+        The index is built on first use.
+        """
+        if self._suggestions is None:
+            self._suggestions = SuggestionIndex(self.words | self.permitted)
+        return self._suggestions.suggest(word, count)
+
+    def is_known(self, word):
+        return (
+            word in self.permitted or
+            word in self.words or
+            rx_item_number.match(word) is not None or
+            rx_zero_padded.match(word) is not None or
+            rx_alpha_number.match(word) is not None
+        )
+
+    def __getstate__(self):
+        # workers only check, so the suggestion index stays behind
+        state = self.__dict__.copy()
+        state['_suggestions'] = None
+        return state
+
+    def _check_items_cached(self, items, workers, batch_size, cache):
+        cache.sync(self)
+        loci = []
+        stale = []
+        for obj_id, datum in items:
+            for field, value in datum.items():
+                if field in self.skip_fields or value is None:
+                    continue
+                value_digest = digest(value)
+                entry = cache.get(obj_id, field, value_digest)
+                if entry is None:
+                    entry = [value_digest, None, None]
+                    stale.append((entry, value))
+                loci.append((obj_id, field, entry))
+        logger.info(
+            'Checking {} of {} values; the rest are cached'
+            ''.format(len(stale), len(loci)))
+        values = [value for entry, value in stale]
+        if workers is None or workers <= 1:
+            results = map(self.classify_value, values)
+        else:
+            batches = [
+                values[i:i + batch_size]
+                for i in range(0, len(values), batch_size)]
+            results = (
+                result for batch_results
+                in self._run_batches(batches, _classify_batch, workers)
+                for result in batch_results)
+        for (entry, value), (unknown, known) in zip(stale, results):
+            entry[1:] = [unknown, known]
+        words = {}
+        entries = {}
+        for obj_id, field, entry in loci:
+            entries.setdefault(obj_id, {})[field] = entry
+            for t in entry[1]:
+                words.setdefault(t, []).append((obj_id, field))
+        cache.entries = entries
+        return words
+
+    def _run_batches(self, batches, func, workers):
+        # each worker process gets a copy of this checker once, up front
+        return run_in_pool(
+            func, batches, workers, initializer=_init_worker,
+            initargs=(self,))
+
+    def _check_batch(self, items):
+        words = {}
+        for obj_id, datum in items:
+            for field, value in datum.items():
+                if field in self.skip_fields or value is None:
+                    continue
+                for t in self.check_value(value):
+                    words.setdefault(t, []).append((obj_id, field))
+        return words
+
+    def _merge(self, words, batch_words):
+        for t, loci in batch_words.items():
+            words.setdefault(t, []).extend(loci)
+
+    def _text_fields(self, datum):
+        # only what a worker needs to see goes over the process boundary
+        return {
+            field: value for field, value in datum.items()
+            if field not in self.skip_fields and value is not None}
+
+    def _is_number(self, token):
+        # pure numbers are ignored, but not zero-padded ones
+        try:
+            return str(int(token)) == token
+        except ValueError:
+            return False
+
+
+class SuggestionIndex(object):
+    """
+    Finds dictionary words within a small edit distance of a misspelling,
+    using a SymSpell-style deletion index: every string obtainable by
+    deleting up to max_distance characters from the first prefix_length
+    characters of a word points back to that word. A lookup only has to
+    generate the deletions of the misspelling, gather the words they point
+    to and verify those with a real (Damerau-Levenshtein) distance.
+    """
+
+    def __init__(self, words, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.deletes = {}
+        for word in words:
+            if word == '':
+                continue
+            for d in self._deletes(word[:prefix_length]):
+                self.deletes.setdefault(d, []).append(word)
+
+    def suggest(self, word, count=3):
+        """
+        Return up to count words, nearest first (ties in alphabetical
+        order).
+        """
+        candidates = set()
+        for d in self._deletes(word[:self.prefix_length]):
+            candidates.update(self.deletes.get(d, ()))
+        scored = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) > self.max_distance:
+                continue
+            distance = edit_distance(word, candidate)
+            if distance <= self.max_distance:
+                scored.append((distance, candidate))
+        return [candidate for distance, candidate in sorted(scored)[:count]]
+
+    def _deletes(self, s):
+        found = {s}
+        edge = [s]
+        for _ in range(self.max_distance):
+            next_edge = []
+            for e in edge:
+                for i in range(len(e)):
+                    d = e[:i] + e[i + 1:]
+                    if d not in found:
+                        found.add(d)
+                        next_edge.append(d)
+            edge = next_edge
+        return found
+
+
+def edit_distance(a, b):
+    """
+    Optimal string alignment distance: insertions, deletions, substitutions
+    and transpositions of adjacent characters each cost 1.
+    """
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost)
+            if (
+                i > 1 and j > 1 and a[i - 1] == b[j - 2] and
+                a[i - 2] == b[j - 1]
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[len(b)]
+
+
+# set in each worker process of a parallel check
+_worker_checker = None
+
+
+def _init_worker(checker):
+    global _worker_checker
+    _worker_checker = checker
+
+
+def _check_batch(batch):
+    return _worker_checker._check_batch(batch)
+
+
+def _classify_batch(values):
+    return [_worker_checker.classify_value(value) for value in values]
+
+
+class SpellingCache(object):
+    """
+    Results of earlier spelling checks, so that re-runs only check values
+    that changed.
+
+    Entries are kept per object and field as [content digest, unknown
+    words, dictionary words]. The dictionary (plus permitted words) in use
+    is stored too. When it changes, words added to it are simply dropped
+    from cached unknown lists. Entries that relied on a word that has since
+    been removed are discarded and rechecked. A change to the tokenizing
+    rules discards everything.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.rules = None
+        self.dictionary = frozenset()
+        self.entries = {}
+        if path is not None:
+            j = read_versioned_json(
+                path, SPELLING_CACHE_VERSION, 'spelling cache')
+            if j is not None:
+                self.rules = j['rules']
+                self.dictionary = frozenset(j['dictionary'])
+                self.entries = j['entries']
+
+    def __len__(self):
+        return sum(len(fields) for fields in self.entries.values())
+
+    def get(self, obj_id, field, value_digest):
+        """Return the cached entry for a value, or None if there isn't a
+        current one."""
+        try:
+            entry = self.entries[obj_id][field]
+        except KeyError:
+            return None
+        if entry[0] != value_digest:
+            return None
+        return entry
+
+    def save(self, path=None):
+        if path is None:
+            path = self.path
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    'version': SPELLING_CACHE_VERSION,
+                    'rules': self.rules,
+                    'dictionary': sorted(self.dictionary),
+                    'entries': self.entries
+                },
+                f,
+                ensure_ascii=False
+            )
+
+    def sync(self, checker):
+        """Bring cached results up to date with checker's dictionary."""
+        rules = rules_digest()
+        dictionary = checker.words | checker.permitted
+        if rules != self.rules:
+            self.entries = {}
+        elif dictionary != self.dictionary:
+            added = dictionary - self.dictionary
+            removed = self.dictionary - dictionary
+            for fields in self.entries.values():
+                for field, entry in list(fields.items()):
+                    value_digest, unknown, known = entry
+                    if not removed.isdisjoint(known):
+                        del fields[field]
+                    elif not added.isdisjoint(unknown):
+                        entry[1] = [t for t in unknown if t not in added]
+                        entry[2] = sorted(
+                            set(known).union(added.intersection(unknown)))
+        self.rules = rules
+        self.dictionary = dictionary
+
+
+def format_report(words, get_value, suggest=None):
+    """
+    Yield report lines for the result of SpellChecker.check_items(): each
+    word in sorted order followed by its loci, with the first 80 characters
+    of the field value returned by get_value(obj_id, field). If suggest is
+    given (e.g. SpellChecker.suggest), the candidates it returns for each
+    word are shown next to it.
+    """
+    for word in sorted(words):
+        if suggest is None:
+            yield word
+        else:
+            yield '{} (suggestions: {})'.format(
+                word, ', '.join(suggest(word)) or 'none')
+        for obj_id, field in words[word]:
+            yield '\t{}[{}]: {}'.format(
+                obj_id, field, get_value(obj_id, field)[0:80])
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Summary templates for exhibition objects
+
+An exhibition declares its summary as a list of parts. Each part is a
+function that takes an object's data and returns a piece of text, or None to
+contribute nothing. The builders below (text, compose, first, choose, fail
+and the field predicates) cover the usual cases, and any other function of
+the data can be used alongside them. A SummaryTemplate compiles its parts
+once and then renders summaries for whole collections.
+"""
+
+import logging
+from string import Formatter
+import textnorm
+
+logger = logging.getLogger(__name__)
+
+
+def summary_artist(data, suppress_unknown=True):
+    artist = data['artist']
+    if artist is not None:
+        if not suppress_unknown or 'unknown' not in artist.lower():
+            return artist
+    return None
+
+
+def summary_inventory_num(data, suppress_unknown=True):
+    invno = data['inventory_num']
+    if invno is not None:
+        if (
+            not suppress_unknown or
+            (
+                'unknown' not in invno and
+                invno != 'N/A'
+            )
+        ):
+            return invno
+    return None
+
+
+def summary_title(data, include_detail=False):
+    title_types = ['full_title', 'title']
+    if include_detail:
+        title_types = ['title_detail'] + title_types
+    for fullest in title_types:
+        if data[fullest] is not None:
+            return data[fullest]
+    raise RuntimeError(
+        'No valid titles in object {}'.format(data['id'])
+    )
+
+
+def summary_title_detail(data):
+    return summary_title(data, include_detail=True)
+
+
+def text(s):
+    """Part that always gives s."""
+    return lambda data: s
+
+
+def compose(pattern, **getters):
+    """
+    Part that fills a str.format pattern with named values. Each name is a
+    field of the object unless a getter function of the data is given for
+    it. Nothing is given if any of the values is None.
+    """
+    names = []
+    for literal, name, spec, conversion in Formatter().parse(pattern):
+        if name is not None and name not in names:
+            names.append(name)
+    lookups = [
+        (name, getters.get(name, _field_getter(name))) for name in names]
+
+    def part(data):
+        values = {}
+        for name, get in lookups:
+            v = get(data)
+            if v is None:
+                return None
+            values[name] = v
+        return pattern.format_map(values)
+    return part
+
+
+def first(*parts):
+    """Part that gives the result of the first of parts to give anything."""
+    def part(data):
+        for p in parts:
+            s = p(data)
+            if s is not None:
+                return s
+        return None
+    return part
+
+
+def choose(*cases, default=None):
+    """
+    Part that renders the part of the first (predicate, part) case whose
+    predicate holds for the data, or default (if any) when none does.
+    """
+    def part(data):
+        for predicate, p in cases:
+            if predicate(data):
+                return p(data)
+        if default is not None:
+            return default(data)
+        return None
+    return part
+
+
+def fail(message):
+    """Part that raises RuntimeError; message is formatted with the data."""
+    def part(data):
+        raise RuntimeError(message.format_map(data))
+    return part
+
+
+def field_is(field, *values):
+    values = frozenset(values)
+    return lambda data: data[field] in values
+
+
+def field_contains(field, s, casefold=False):
+    if casefold:
+        s = s.casefold()
+        return lambda data: (
+            data[field] is not None and s in data[field].casefold())
+    return lambda data: data[field] is not None and s in data[field]
+
+
+def _field_getter(field):
+    return lambda data: data[field]
+
+
+class SummaryTemplate(object):
+    """
+    A compiled summary recipe. The text of parts is joined and ended with
+    a period if it lacks one, then the exhibition blurb (if any) is
+    appended, also ending with a period. If lead is given and produces
+    text, it goes first and the first letter of what follows is
+    lower-cased. Objects whose ids appear in overrides get that text (plus
+    the blurb) instead.
+    """
+
+    def __init__(self, parts, lead=None, overrides=None):
+        self.parts = tuple(parts)
+        self.lead = lead
+        self.overrides = {} if overrides is None else overrides
+
+    def render(self, data, exhibition_blurb=None):
+        try:
+            summary = self.overrides[data['id']]
+        except KeyError:
+            pass
+        else:
+            if exhibition_blurb is not None:
+                summary = textnorm.normalize_space(
+                    ' '.join((summary, exhibition_blurb)))
+            return summary
+        lead = None if self.lead is None else self.lead(data)
+        pieces = []
+        for part in self.parts:
+            s = part(data)
+            if s is not None:
+                pieces.append(s)
+        if lead:
+            if pieces and pieces[0]:
+                pieces[0] = pieces[0][0].lower() + pieces[0][1:]
+            pieces.insert(0, lead)
+        summary = ''.join(pieces)
+        if summary[-1:] != '.':
+            summary += '.'
+        if exhibition_blurb is not None:
+            summary = ' '.join((summary, exhibition_blurb))
+            if summary[-1] != '.':
+                summary += '.'
+        return summary
+
+    def render_all(self, objects, exhibition_blurb=None):
+        """Yield (obj_id, summary) for (obj_id, ExhibitionObject) pairs."""
+        render = self.render
+        for obj_id, obj in objects:
+            yield (obj_id, render(obj.data, exhibition_blurb))
+
+
+# the generic summary: title, artist, place, lender and inventory number
+DEFAULT_SUMMARY_TEMPLATE = SummaryTemplate([
+    compose('{title}', title=summary_title),
+    compose(' by {artist}', artist=summary_artist),
+    compose(' from {object_location}'),
+    first(
+        compose(
+            '. Lent by {lender} (inventory number: {inventory_num}).',
+            inventory_num=summary_inventory_num),
+        compose('. Lent by {lender}.')
+    )
+])
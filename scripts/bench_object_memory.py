@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compare memory used by ExhibitionObject storage against plain field dicts
+"""
+
+from airtight.cli import configure_commandline
+from exhibitor.ishtar2019 import IshtarCollection
+from exhibitor.objects import ObjectData, fields
+import logging
+from pathlib import Path
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_LEVEL = logging.WARNING
+OPTIONAL_ARGUMENTS = [
+    ['-l', '--loglevel', 'NOTSET',
+        'desired logging level (' +
+        'case-insensitive string: DEBUG, INFO, WARNING, or ERROR',
+        False],
+    ['-v', '--verbose', False, 'verbose output (logging level == INFO)',
+        False],
+    ['-w', '--veryverbose', False,
+        'very verbose output (logging level == DEBUG)', False],
+    ['-c', '--copies', 100, 'number of copies of each source object', False]
+]
+POSITIONAL_ARGUMENTS = [
+    # each row is a list with 3 elements: name, type, help
+    ['source', str, 'path to Ishtar raw data CSV'],
+]
+
+
+def measure(make, sources, copies):
+    tracemalloc.start()
+    kept = [make(src) for src in sources for _ in range(copies)]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(kept), size
+
+
+def make_dict(src):
+    d = {}
+    for field in fields:
+        d[field] = None
+    d.update(src)
+    return d
+
+
+def make_attached(src, owner):
+    d = ObjectData(src)
+    d.attach(owner)
+    return d
+
+
+def main(**kwargs):
+    """
+    main function
+    """
+    # logger = logging.getLogger(sys._getframe().f_code.co_name)
+    source = Path(kwargs['source'])
+    copies = int(kwargs['copies'])
+    ic = IshtarCollection()
+    ic.load(source, merge=True)
+    sources = [dict(o.data) for o in ic.objects.values()]
+    makers = [
+        ('dict', make_dict),
+        ('ObjectData', ObjectData),
+        ('ObjectData in a collection', lambda src: make_attached(src, ic))
+    ]
+    for label, make in makers:
+        count, size = measure(make, sources, copies)
+        print(
+            '{}: {} objects, {} bytes ({:.1f} bytes/object)'
+            ''.format(label, count, size, size / count))
+
+
+if __name__ == "__main__":
+    main(**configure_commandline(
+            OPTIONAL_ARGUMENTS, POSITIONAL_ARGUMENTS, DEFAULT_LOG_LEVEL))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Time slug generation from titles against the original algorithm
+"""
+
+from airtight.cli import configure_commandline
+from exhibitor.ishtar2019 import IshtarCollection
+from exhibitor.slugs import SlugRules, cached_slugify
+import logging
+from pathlib import Path
+from slugify import slugify
+import textnorm
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_LEVEL = logging.WARNING
+OPTIONAL_ARGUMENTS = [
+    ['-l', '--loglevel', 'NOTSET',
+        'desired logging level (' +
+        'case-insensitive string: DEBUG, INFO, WARNING, or ERROR',
+        False],
+    ['-v', '--verbose', False, 'verbose output (logging level == INFO)',
+        False],
+    ['-w', '--veryverbose', False,
+        'very verbose output (logging level == DEBUG)', False],
+    ['-c', '--copies', 1000, 'number of copies of each title', False]
+]
+POSITIONAL_ARGUMENTS = [
+    # each row is a list with 3 elements: name, type, help
+    ['source', str, 'path to Ishtar raw data CSV'],
+]
+
+
+def original_slug(title):
+    # ObjectCollection.make_slugs before SlugRules
+    slug = title
+    for punct in [':', '(', '.', ';', ',']:
+        if punct in slug:
+            slug = slug.split(punct)[0].strip()
+    slug = textnorm.normalize_space(slug)
+    words = slug.split()
+    for skip in ['of', 'with', 'from']:
+        try:
+            idx = words.index(skip)
+        except ValueError:
+            continue
+        else:
+            del words[idx]
+    slug = ' '.join(words)
+    return slugify(slug, only_ascii=True)
+
+
+def main(**kwargs):
+    """
+    main function
+    """
+    # logger = logging.getLogger(sys._getframe().f_code.co_name)
+    source = Path(kwargs['source'])
+    copies = int(kwargs['copies'])
+    ic = IshtarCollection()
+    ic.load(source, merge=True)
+    titles = [o.data['title'] for o in ic.objects.values()] * copies
+    rules = SlugRules()
+    cached_slugify.cache_clear()
+    start = perf_counter()
+    original = [original_slug(t) for t in titles]
+    original_time = perf_counter() - start
+    start = perf_counter()
+    compiled = [rules.make(t) for t in titles]
+    compiled_time = perf_counter() - start
+    if original != compiled:
+        raise RuntimeError('Compiled slug rules disagree with the original')
+    print('{} titles, identical slugs'.format(len(titles)))
+    print('original: {:.3f}s'.format(original_time))
+    print('SlugRules: {:.3f}s ({})'.format(
+        compiled_time, cached_slugify.cache_info()))
+
+
+if __name__ == "__main__":
+    main(**configure_commandline(
+            OPTIONAL_ARGUMENTS, POSITIONAL_ARGUMENTS, DEFAULT_LOG_LEVEL))
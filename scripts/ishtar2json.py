@@ -6,6 +6,7 @@ Convert raw Ishtar CSV to clean JSON
 
 from airtight.cli import configure_commandline
 from exhibitor.ishtar2019 import IshtarCollection
+from exhibitor.objects import guess_file_type
 import logging
 from pathlib import Path
 
@@ -21,11 +22,14 @@ OPTIONAL_ARGUMENTS = [
         False],
     ['-w', '--veryverbose', False,
         'very verbose output (logging level == DEBUG)', False],
+    ['-j', '--jobs', 1,
+        'number of worker processes to use for cleaning values', False],
 ]
 POSITIONAL_ARGUMENTS = [
     # each row is a list with 3 elements: name, type, help
     ['source', str, 'path to Ishtar raw data CSV'],
-    ['destination', str, 'path to use when outputing JSON']
+    ['destination', str,
+        'path to use when outputing JSON (or msgpack, if it ends .msgpack)']
 ]
 
 
@@ -37,8 +41,9 @@ def main(**kwargs):
     source = Path(kwargs['source'])
     destination = Path(kwargs['destination'])
     ic = IshtarCollection()
-    ic.load(source, merge=True)
-    ic.dump(file_path=destination)
+    jobs = int(kwargs['jobs'])
+    ic.load(source, merge=True, workers=jobs if jobs > 1 else None)
+    ic.dump(file_path=destination, file_type=guess_file_type(destination))
     print('Saved result file at {}'.format(destination.absolute()))
 
 
@@ -5,7 +5,10 @@ Prepare Ishtar data for upload
 """
 
 from airtight.cli import configure_commandline
+from exhibitor.images import ImageInfoCache
 from exhibitor.ishtar2019 import IshtarCollection
+from exhibitor.objects import guess_file_type
+import json
 import logging
 from pathlib import Path
 import sys
@@ -23,12 +26,40 @@ OPTIONAL_ARGUMENTS = [
     ['-w', '--veryverbose', False,
         'very verbose output (logging level == DEBUG)', False],
     ['-i', '--images', 'NOTSET', 'path to images directory', False],
-    ['-a', '--alt', 'NOTSET', 'path to csv file containing alt text', False]
+    ['-a', '--alt', 'NOTSET', 'path to csv file containing alt text', False],
+    ['-r', '--recursive', False,
+        'also look for images in subdirectories of the images directory',
+        False],
+    ['-j', '--jobs', 1,
+        'number of threads to use when scanning and inspecting images '
+        '(and of processes, when making derivatives)', False],
+    ['-m', '--metadata', 'NOTSET',
+        'path for a JSON file of image format, dimensions, size and '
+        'checksum by object id', False],
+    ['-c', '--cache', 'NOTSET',
+        'path to an image metadata cache file, so re-runs only read '
+        'changed images', False],
+    ['-d', '--derivatives', 'NOTSET',
+        'directory in which to make resized web derivatives of the images',
+        False],
+    ['-x', '--hash', False,
+        'decide whether derivatives are up to date by content hash rather '
+        'than modification time', False],
+    ['-p', '--previous', 'NOTSET',
+        'path to the previous run\'s output (or its digest manifest) to '
+        'compare this run against', False],
+    ['-t', '--delta', 'NOTSET',
+        'path for a JSON file of ids added, changed and removed since the '
+        'previous run (requires -p)', False],
+    ['-g', '--digests', 'NOTSET',
+        'path for a digest manifest of this run, to compare the next one '
+        'against', False]
 ]
 POSITIONAL_ARGUMENTS = [
     # each row is a list with 3 elements: name, type, help
-    ['source', str, 'path to Ishtar raw data JSON'],
-    ['destination', str, 'path to use when outputing JSON']
+    ['source', str, 'path to Ishtar raw data JSON (or .msgpack)'],
+    ['destination', str,
+        'path to use when outputing JSON (or msgpack, if it ends .msgpack)']
 ]
 
 
@@ -39,8 +70,12 @@ def main(**kwargs):
     # logger = logging.getLogger(sys._getframe().f_code.co_name)
     source = Path(kwargs['source'])
     destination = Path(kwargs['destination'])
+    if kwargs['delta'] != 'NOTSET' and kwargs['previous'] == 'NOTSET':
+        raise RuntimeError(
+            'A delta file (-t) can only be written when comparing with a '
+            'previous run (-p)')
     ic = IshtarCollection(crosswalk=None)
-    ic.load(source, 'json')
+    ic.load(source, guess_file_type(source))
     ic.fix_titles()
     ic.make_slugs()
     ic.make_summaries(
@@ -62,9 +97,47 @@ def main(**kwargs):
                 'accessibility laws and policies.'
                 ''.format(images_path.absolute())
             )
-        ic.add_images(images_path, alt_text_path)
-    ic.dump(destination)
+        jobs = int(kwargs['jobs'])
+        workers = jobs if jobs > 1 else None
+        ic.add_images(
+            images_path, alt_text_path, recursive=kwargs['recursive'],
+            workers=workers)
+        if kwargs['metadata'] != 'NOTSET':
+            cache = None
+            if kwargs['cache'] != 'NOTSET':
+                cache = ImageInfoCache(Path(kwargs['cache']))
+            image_info = ic.inspect_images(images_path, workers, cache)
+            if cache is not None:
+                cache.save()
+            with open(kwargs['metadata'], 'w', encoding='utf-8') as f:
+                json.dump(
+                    {
+                        obj_id: info._asdict()
+                        for obj_id, info in image_info.items()},
+                    f, ensure_ascii=False, indent=4)
+        if kwargs['derivatives'] != 'NOTSET':
+            ic.make_derivatives(
+                images_path, Path(kwargs['derivatives']),
+                check='hash' if kwargs['hash'] else 'mtime',
+                workers=workers)
+    # compare before dumping: the previous run may have been written to the
+    # same destination
+    delta = None
+    if kwargs['previous'] != 'NOTSET':
+        delta = ic.delta(Path(kwargs['previous']))
+    ic.dump(destination, guess_file_type(destination))
     print('Results written to {}'.format(destination.absolute()))
+    if delta is not None:
+        print(
+            'Since the previous run: {} added, {} changed, {} removed, '
+            '{} unchanged'.format(
+                len(delta.added), len(delta.changed), len(delta.removed),
+                delta.unchanged))
+        if kwargs['delta'] != 'NOTSET':
+            with open(kwargs['delta'], 'w', encoding='utf-8') as f:
+                json.dump(delta.as_dict(), f, indent=4)
+    if kwargs['digests'] != 'NOTSET':
+        ic.dump(Path(kwargs['digests']), 'digests')
     sys.exit()
     
     ic.dump()
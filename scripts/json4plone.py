@@ -5,10 +5,12 @@ Prepare Exhibition Object JSON for upload to Plone
 """
 
 from airtight.cli import configure_commandline
+from exhibitor.changes import (
+    compare_digests, content_digest, read_digests, write_digests)
+from exhibitor.objects import guess_file_type, iter_dump
 import json
 import logging
 from pathlib import Path
-from pprint import pprint
 
 logger = logging.getLogger(__name__)
 
@@ -22,15 +24,39 @@ OPTIONAL_ARGUMENTS = [
         False],
     ['-w', '--veryverbose', False,
         'very verbose output (logging level == DEBUG)', False],
+    ['-p', '--previous', 'NOTSET',
+        'path to the digest manifest (.digests, written with -g) of the '
+        'previous upload; only new and changed items will be written',
+        False],
+    ['-d', '--deletions', 'NOTSET',
+        'path for plone-ready JSON of the items to delete because they are '
+        'gone since the previous upload (requires -p)', False],
+    ['-g', '--digests', 'NOTSET',
+        'path for a digest manifest of the items, to compare the next '
+        'upload against', False]
 ]
 POSITIONAL_ARGUMENTS = [
     # each row is a list with 3 elements: name, type, help
     ['url_path', str, 'path on the server where the collection will reside'],
-    ['source', str, 'path to exhibitor JSON'],
+    ['source', str, 'path to exhibitor JSON (or .msgpack)'],
     ['destination', str, 'path to use when outputing plone-ready JSON']
 ]
 
 
+def read_previous_digests(path):
+    """
+    Return item digests by plone id from a digest manifest written with -g.
+    Plone-ready JSON is not accepted: one written with -p holds only the
+    items that changed, so comparing against it would re-add the rest and
+    miss deletions, and nothing in the payload says which kind it is.
+    """
+    if guess_file_type(path) != 'digests':
+        raise RuntimeError(
+            'The previous upload ({}) must be given as the .digests manifest '
+            'written for it with -g'.format(path))
+    return read_digests(path)
+
+
 def main(**kwargs):
     """
     main function
@@ -38,31 +64,61 @@ def main(**kwargs):
     # logger = logging.getLogger(sys._getframe().f_code.co_name)
     source = Path(kwargs['source'])
     destination = Path(kwargs['destination'])
-    with open(source, 'r', encoding='utf-8') as f:
-        j = json.load(f)
-    del f
-    items = []
-    for orig_id, obj_data in j.items():
-        item = {}
-        for field_name, field_value in obj_data.items():
-            if field_name not in ['id', 'slug', 'summary']:
-                if field_value is not None:
-                    item[field_name] = field_value
-        item['id'] = obj_data['slug']
-        item['description'] = obj_data['summary']
-        items.append(item)
-    payload = {
-        'items': []
-    }
-    for item in items:
-        payload['items'].append(
-            {
-                kwargs['url_path']: item
-            }
-        )
+    url_path = kwargs['url_path']
+    previous = None
+    if kwargs['previous'] != 'NOTSET':
+        previous = read_previous_digests(Path(kwargs['previous']))
+        if kwargs['digests'] == 'NOTSET':
+            logger.warning(
+                'No digest manifest will be saved, so the next upload cannot '
+                'be compared with this one; use -g to save one')
+    digests = {}
+    # items are converted and written one at a time; the output is the
+    # same as json.dump(payload, indent=4, sort_keys=True) of
+    # {'items': [{url_path: item}, ...]}
     with open(destination, 'w', encoding='utf-8') as f:
-        json.dump(payload, f, ensure_ascii=False, indent=4, sort_keys=True)
+        f.write('{\n    "items": [')
+        separator = '\n        '
+        for orig_id, obj_data in iter_dump(source):
+            item = {}
+            for field_name, field_value in obj_data.items():
+                if field_name not in ['id', 'slug', 'summary']:
+                    if field_value is not None:
+                        item[field_name] = field_value
+            item['id'] = obj_data['slug']
+            item['description'] = obj_data['summary']
+            digest = content_digest(item)
+            digests[item['id']] = digest
+            if previous is not None and previous.get(item['id']) == digest:
+                continue
+            j = json.dumps(
+                {url_path: item},
+                ensure_ascii=False, indent=4, sort_keys=True)
+            f.write(separator)
+            f.write(j.replace('\n', '\n        '))
+            separator = ',\n        '
+        if separator.startswith(','):
+            f.write('\n    ')
+        f.write(']\n}')
     del f
+    if previous is not None:
+        delta = compare_digests(digests, previous)
+        print(
+            'Wrote {} new and {} changed items; {} unchanged, {} removed'
+            ''.format(
+                len(delta.added), len(delta.changed), delta.unchanged,
+                len(delta.removed)))
+        if kwargs['deletions'] != 'NOTSET':
+            with open(kwargs['deletions'], 'w', encoding='utf-8') as f:
+                json.dump(
+                    {
+                        'items': [
+                            {url_path: {'id': plone_id}}
+                            for plone_id in delta.removed]},
+                    f, ensure_ascii=False, indent=4, sort_keys=True)
+    if kwargs['digests'] != 'NOTSET':
+        with open(kwargs['digests'], 'w', encoding='utf-8') as f:
+            write_digests(f, digests)
 
 
 if __name__ == "__main__":
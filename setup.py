@@ -14,11 +14,13 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     
     packages=setuptools.find_packages(),
+    package_data={'exhibitor': ['data/*/*.json']},
     classifiers=[
         "Programming Language :: Python :: 3.8.0",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    install_requires=['airtight', 'encoded_csv'],
+    install_requires=['airtight', 'chardet', 'encoded_csv', 'msgpack'],
+    extras_require={'derivatives': ['Pillow']},
     python_requires='>=3.8.0'
 )
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor caches module"""
+
+from exhibitor.caches import read_versioned_json
+import json
+import logging
+from nose.tools import assert_equal
+from pathlib import Path
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+test_data_path = Path() / 'tests' / 'data'
+temp_path = test_data_path / 'out_cache.json'
+
+
+def teardown_module():
+    try:
+        temp_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class Test_Caches(TestCase):
+
+    def test_read_versioned_json(self):
+        """Caches: only files of the expected version are read"""
+        assert_equal(None, read_versioned_json(temp_path, 1, 'test cache'))
+        temp_path.write_text(json.dumps({'version': 1, 'entries': {'a': 1}}))
+        assert_equal(
+            {'version': 1, 'entries': {'a': 1}},
+            read_versioned_json(temp_path, 1, 'test cache'))
+        assert_equal(None, read_versioned_json(temp_path, 2, 'test cache'))
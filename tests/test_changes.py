@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor changes module"""
+
+from exhibitor.changes import (
+    compare_digests, content_digest, object_digest, read_digests,
+    write_digests)
+from exhibitor.objects import ObjectCollection, dump_digests
+import logging
+from nose.tools import assert_equal, assert_false, assert_true, raises
+from pathlib import Path
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+test_data_path = Path() / 'tests' / 'data'
+temp_paths = [
+    test_data_path / 'out_changes.json',
+    test_data_path / 'out_changes.msgpack',
+    test_data_path / 'out_changes.digests',
+    test_data_path / 'out_items.digests'
+]
+
+
+def teardown_module():
+    for path in temp_paths:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def make_collection():
+    oc = ObjectCollection()
+    oc.load(test_data_path / 'raw_object_data.csv')
+    return oc
+
+
+class Test_Digests(TestCase):
+
+    def test_object_digest(self):
+        """Changes: digests cover the given fields only"""
+        fields = ['id', 'title']
+        a = object_digest({'id': 'a', 'title': 'A', 'x': 1}, fields)
+        assert_equal(a, object_digest({'title': 'A', 'id': 'a'}, fields))
+        assert_false(a == object_digest({'id': 'a', 'title': 'B'}, fields))
+        assert_false(a == object_digest({'id': 'a', 'title': 'A'}, ['title']))
+
+    def test_item_manifest(self):
+        """Changes: manifests of whole-item digests round trip"""
+        digests = {
+            'foo': content_digest({'id': 'foo', 'title': 'Foo'}),
+            'bar': content_digest({'title': 'Bar', 'id': 'bar'})}
+        assert_equal(
+            digests['bar'], content_digest({'id': 'bar', 'title': 'Bar'}))
+        with open(temp_paths[3], 'w', encoding='utf-8') as f:
+            write_digests(f, digests)
+        assert_equal(digests, read_digests(temp_paths[3]))
+
+    @raises(RuntimeError)
+    def test_manifest_kind(self):
+        """Changes: object digests are not taken for item digests"""
+        make_collection().dump(temp_paths[2], 'digests')
+        read_digests(temp_paths[2])
+
+    @raises(RuntimeError)
+    def test_manifest_fields(self):
+        """Changes: digests over other fields are rejected"""
+        with open(temp_paths[3], 'w', encoding='utf-8') as f:
+            write_digests(f, {}, ['id'])
+        dump_digests(temp_paths[3])
+
+    def test_compare(self):
+        """Changes: compare digests by id"""
+        delta = compare_digests(
+            {'a': '1', 'b': '2', 'c': '3'}, {'d': '4', 'b': '2', 'a': '0'})
+        assert_equal(['c'], delta.added)
+        assert_equal(['a'], delta.changed)
+        assert_equal(['d'], delta.removed)
+        assert_equal(1, delta.unchanged)
+        assert_equal(['a', 'c'], delta.updated_ids())
+        assert_true(delta)
+        assert_false(compare_digests({'a': '1'}, {'a': '1'}))
+
+
+class Test_CollectionDelta(TestCase):
+
+    def test_same_in_every_format(self):
+        """Changes: a dump in any format has the collection's digests"""
+        oc = make_collection()
+        for path in temp_paths[:3]:
+            oc.dump(path, path.suffix[1:])
+            assert_equal(oc.digests(), dump_digests(path))
+            assert_false(oc.delta(path))
+
+    def test_delta(self):
+        """Changes: collections report what changed since a dump"""
+        oc = make_collection()
+        oc.dump(temp_paths[0])
+        oc.objects['foo'].data['title'] = 'New Foo'
+        oc.objects['foo'].data._extra = {'ignored': True}
+        oc.remove('bar')
+        oc.add({'id': 'baz', 'title': 'Baz'})
+        delta = oc.delta(temp_paths[0])
+        assert_equal(
+            {
+                'added': ['baz'], 'changed': ['foo'], 'removed': ['bar'],
+                'unchanged': len(oc) - 2},
+            delta.as_dict())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor cleaning module"""
+
+from exhibitor.cleaning import (
+    cached_clean_value, clean_row, clean_rows, clean_value,
+    make_value_cleaner)
+from exhibitor.ishtar2019 import IshtarCollection
+from exhibitor.objects import iter_csv
+import logging
+from nose.tools import assert_equal, assert_false, assert_true, raises
+from pathlib import Path
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+test_data_path = Path() / 'tests' / 'data'
+
+
+class Test_Cleaning(TestCase):
+
+    def test_clean_value(self):
+        """Cleaning: normalize a single value"""
+        assert_equal('Foo lish', clean_value('\nFoo  lish '))
+        assert_equal('é', clean_value('é'))
+        assert_equal(None, clean_value('  '))
+        assert_equal(None, clean_value(None))
+
+    def test_value_cleaner(self):
+        """Cleaning: memoized cleaner counts hits and shares strings"""
+        cleaner = make_value_cleaner(maxsize=2)
+        a = cleaner(' '.join(['Staatliche', 'Museen ']))
+        b = cleaner(' '.join(['Staatliche', 'Museen ']))
+        assert_equal('Staatliche Museen', a)
+        assert_true(a is b)
+        info = cleaner.cache_info()
+        assert_equal((1, 1), (info.hits, info.misses))
+        cleaner('foo')
+        cleaner('bar')
+        assert_equal(2, cleaner.cache_info().currsize)
+        assert_equal(None, cleaner(' '))
+
+    def test_cached_matches_plain(self):
+        """Cleaning: memoized cleaner gives the plain result"""
+        path = test_data_path / 'ishtar_2019-08-21.csv'
+        for row in iter_csv(path, sample_lines=1000):
+            for v in row.values():
+                assert_equal(clean_value(v), cached_clean_value(v))
+
+    def test_clean_row(self):
+        """Cleaning: id is passed through verbatim"""
+        assert_equal(
+            {'id': ' foo ', 'title': 'Foo'},
+            clean_row({'id': ' foo ', 'title': ' Foo'}))
+
+    def test_parallel_matches_serial(self):
+        """Cleaning: process pool gives the serial result, in order"""
+        path = test_data_path / 'ishtar_2019-08-21.csv'
+        serial = list(clean_rows(iter_csv(path, sample_lines=1000)))
+        parallel = list(
+            clean_rows(
+                iter_csv(path, sample_lines=1000), workers=2, batch_size=7))
+        assert_equal(serial, parallel)
+
+    def test_parallel_shares_strings(self):
+        """Cleaning: repeated values from workers are one string"""
+        path = test_data_path / 'ishtar_2019-08-21.csv'
+        rows = list(clean_rows(iter_csv(path), workers=2, batch_size=7))
+        lenders = [row['Lender'] for row in rows if row['Lender']]
+        distinct = set(lenders)
+        assert_true(len(distinct) < len(lenders))
+        assert_equal(len(distinct), len({id(v) for v in lenders}))
+
+    def test_parallel_load(self):
+        """Cleaning: collection loaded with workers matches serial load"""
+        path = test_data_path / 'ishtar_2019-08-21.csv'
+        serial = IshtarCollection()
+        serial.load(path, merge=True)
+        parallel = IshtarCollection()
+        parallel.load(path, merge=True, workers=2)
+        assert_equal(list(serial.objects), list(parallel.objects))
+        for obj_id, obj in serial.objects.items():
+            assert_equal(obj.data, parallel.objects[obj_id].data)
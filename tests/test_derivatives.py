@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor derivatives module"""
+
+from exhibitor.derivatives import DerivativeMaker, DerivativeSize
+from exhibitor.objects import ObjectCollection
+import logging
+from nose.tools import assert_equal, raises
+import os
+from pathlib import Path
+import shutil
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+test_data_path = Path() / 'tests' / 'data'
+temp_path = test_data_path / 'out_derivatives'
+masters_path = temp_path / 'masters'
+output_path = temp_path / 'web'
+SIZES = [DerivativeSize('large', 800, 600), ('thumb', 100, 100)]
+
+
+def copy_render(source, targets, quality):
+    # stands in for the Pillow renderer: record what would be made
+    with open(source, 'r') as f:
+        content = f.read()
+    for dest, box in targets:
+        with open(dest, 'w') as f:
+            f.write('{} {}x{}'.format(content, *box))
+
+
+def setup_module():
+    shutil.rmtree(temp_path, ignore_errors=True)
+    masters_path.mkdir(parents=True)
+    for obj_id in ['foo', 'bar']:
+        (masters_path / 'test_{}.jpg'.format(obj_id)).write_text(obj_id)
+
+
+def teardown_module():
+    shutil.rmtree(temp_path, ignore_errors=True)
+
+
+def make_collection():
+    oc = ObjectCollection()
+    for obj_id in ['foo', 'bar', 'baz']:
+        oc.add({'id': obj_id, 'title': obj_id})
+    oc.add_images(masters_path, None)
+    return oc
+
+
+class Test_DerivativeMaker(TestCase):
+
+    def setUp(self):
+        shutil.rmtree(output_path, ignore_errors=True)
+
+    def make(self, check, workers=None):
+        maker = DerivativeMaker(
+            output_path, SIZES, check, workers, render=copy_render)
+        images = sorted(
+            (p.stem[5:], str(p)) for p in masters_path.glob('*.jpg'))
+        return [r[:4] for r in maker.make(images)]
+
+    def test_mtime(self):
+        """Derivatives: up-to-date outputs are skipped by mtime"""
+        foo = str(masters_path / 'test_foo.jpg')
+        bar = str(masters_path / 'test_bar.jpg')
+        assert_equal(
+            [
+                ('bar', bar, ['large', 'thumb'], []),
+                ('foo', foo, ['large', 'thumb'], [])],
+            self.make('mtime', workers=2))
+        assert_equal(
+            'foo 800x600',
+            (output_path / 'large' / 'test_foo.jpg').read_text())
+        os.unlink(output_path / 'thumb' / 'test_bar.jpg')
+        stat = os.stat(foo)
+        os.utime(foo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 10))
+        assert_equal(
+            [
+                ('bar', bar, ['thumb'], ['large']),
+                ('foo', foo, ['large', 'thumb'], [])],
+            self.make('mtime'))
+
+    def test_hash(self):
+        """Derivatives: up-to-date outputs are skipped by content hash"""
+        self.make('hash')
+        assert_equal(
+            [['large', 'thumb'], ['large', 'thumb']],
+            [r[3] for r in self.make('hash')])
+        (masters_path / 'test_foo.jpg').write_text('new foo')
+        results = self.make('hash')
+        assert_equal([[], ['large', 'thumb']], [r[2] for r in results])
+        (masters_path / 'test_foo.jpg').write_text('foo')
+
+    @raises(ValueError)
+    def test_bad_check(self):
+        """Derivatives: only mtime and hash checks exist"""
+        DerivativeMaker(output_path, check='size')
+
+    def test_collection(self):
+        """Derivatives: collections make derivatives of their images"""
+        oc = make_collection()
+        results = oc.make_derivatives(
+            masters_path, output_path, SIZES, render=copy_render)
+        assert_equal(['foo', 'bar'], [r.obj_id for r in results])
+        assert_equal(
+            ['large', 'thumb'], sorted(os.listdir(output_path)))
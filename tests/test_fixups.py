@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor fixups module"""
+
+from exhibitor.fixups import FixupStore, FixupTable, exhibition_fixups
+import json
+import logging
+from nose.tools import assert_equal, assert_false, assert_true, raises
+from pathlib import Path
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+test_data_path = Path() / 'tests' / 'data'
+temp_path = test_data_path / 'out_fixups.json'
+
+
+def setup_module():
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'7': 'lion-7', '8': 'bull'}, f)
+
+
+def teardown_module():
+    try:
+        temp_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class Test_FixupTable(TestCase):
+
+    def test_lazy(self):
+        """Fixups: tables read their file on first access only"""
+        table = FixupTable(temp_path)
+        assert_false(table.loaded)
+        assert_equal('lion-7', table['7'])
+        assert_true(table.loaded)
+        assert_equal(['7', '8'], sorted(table))
+        assert_equal(2, len(table))
+        assert_equal(None, table.get('9'))
+
+    @raises(RuntimeError)
+    def test_not_object(self):
+        """Fixups: tables must be JSON objects"""
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(['7', '8'], f)
+        try:
+            FixupTable(temp_path).load()
+        finally:
+            setup_module()
+
+
+class Test_FixupStore(TestCase):
+
+    def test_store(self):
+        """Fixups: stores name tables after their files"""
+        store = FixupStore(test_data_path)
+        assert_true('out_fixups' in store)
+        assert_false('nonexistent' in store)
+        assert_true(store['out_fixups'] is store['out_fixups'])
+        assert_equal('bull', store['out_fixups']['8'])
+
+    @raises(KeyError)
+    def test_missing(self):
+        """Fixups: missing tables raise KeyError"""
+        FixupStore(test_data_path)['nonexistent']
+
+    def test_ishtar(self):
+        """Fixups: Ishtar tables are packaged and unloaded until used"""
+        store = exhibition_fixups('ishtar2019')
+        assert_equal(
+            ['permitted_words', 'slugs', 'summaries', 'titles'],
+            store.names())
+        titles = store['titles']
+        assert_false(titles.loaded)
+        assert_equal('Shipping Crate', titles['1']['title'])
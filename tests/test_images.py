@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor images module"""
+
+from exhibitor.images import (
+    ImageInfo, ImageInfoCache, ImageScanner, inspect_images, read_image_info)
+from exhibitor.objects import ObjectCollection
+import hashlib
+import logging
+from nose.tools import assert_equal, assert_false, raises
+import os
+from pathlib import Path
+import shutil
+import struct
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+test_data_path = Path() / 'tests' / 'data'
+temp_path = test_data_path / 'out_images'
+cache_path = test_data_path / 'out_image_cache.json'
+# a PNG signature and IHDR chunk for a 640x480 image
+PNG_HEADER = (
+    b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' +
+    struct.pack('>II', 640, 480) + b'\x08\x02\x00\x00\x00')
+# SOI, a JFIF APP0 segment, then a baseline frame header for 300x200
+JPEG_HEADER = (
+    b'\xff\xd8' + b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' +
+    b'\x01\x01\x00\x00\x01\x00\x01\x00\x00' +
+    b'\xff\xc0' + struct.pack('>HBHHB', 17, 8, 200, 300, 3) +
+    b'\x01\x22\x00\x02\x11\x01\x03\x11\x01' + b'\xff\xd9')
+
+
+def setup_module():
+    shutil.rmtree(temp_path, ignore_errors=True)
+    for name in [
+        'test_foo.jpg', 'foobar.jpg', 'a/test_bar.png', 'a/b/test_pickle.jpg',
+        'a/b/notes.txt', 'c/test_baz.jpg'
+    ]:
+        path = temp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    (temp_path / 'test_dir.jpg').mkdir()
+    (temp_path / 'test_foo.jpg').write_bytes(JPEG_HEADER)
+    (temp_path / 'a' / 'test_bar.png').write_bytes(PNG_HEADER)
+
+
+def teardown_module():
+    shutil.rmtree(temp_path, ignore_errors=True)
+    try:
+        cache_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class Test_ImageScanner(TestCase):
+
+    def test_flat(self):
+        """Images: scan one directory for image files"""
+        scanner = ImageScanner(temp_path)
+        matches = list(scanner.scan())
+        assert_equal([('foo', 'test_foo.jpg')], [m[:2] for m in matches])
+        assert_equal(str(temp_path / 'test_foo.jpg'), matches[0].path)
+        assert_equal((1, 2, 1), (
+            scanner.directories, scanner.files, scanner.matched))
+
+    def test_recursive(self):
+        """Images: scan subdirectories, serially or in threads"""
+        expected = [
+            ('bar', 'a/test_bar.png'), ('baz', 'c/test_baz.jpg'),
+            ('foo', 'test_foo.jpg'), ('pickle', 'a/b/test_pickle.jpg')]
+        for workers in [None, 4]:
+            scanner = ImageScanner(temp_path, recursive=True, workers=workers)
+            assert_equal(
+                expected, sorted(m[:2] for m in scanner.scan()))
+            assert_equal((5, 6, 4), (
+                scanner.directories, scanner.files, scanner.matched))
+
+    def test_add_images(self):
+        """Images: collections take image names relative to the scan"""
+        oc = ObjectCollection()
+        for obj_id in ['foo', 'pickle']:
+            oc.add({'id': obj_id, 'title': obj_id})
+        scanner = oc.add_images(
+            temp_path, None, fail_on_mismatch=False, recursive=True,
+            workers=2)
+        assert_equal('test_foo.jpg', oc.objects['foo'].data['image'])
+        assert_equal(
+            'a/b/test_pickle.jpg', oc.objects['pickle'].data['image'])
+        assert_equal(4, scanner.matched)
+
+
+class Test_ImageInfo(TestCase):
+
+    def test_read(self):
+        """Images: dimensions come from JPEG and PNG headers"""
+        info = read_image_info(temp_path / 'test_foo.jpg')
+        assert_equal(
+            ImageInfo(
+                'jpeg', 300, 200, len(JPEG_HEADER),
+                hashlib.sha256(JPEG_HEADER).hexdigest()),
+            info)
+        info = read_image_info(temp_path / 'a' / 'test_bar.png')
+        assert_equal(('png', 640, 480, len(PNG_HEADER)), info[:4])
+
+    @raises(RuntimeError)
+    def test_not_image(self):
+        """Images: other files are rejected"""
+        read_image_info(temp_path / 'a' / 'b' / 'notes.txt')
+
+    def test_cache(self):
+        """Images: the cache skips files that have not changed"""
+        paths = [temp_path / 'test_foo.jpg', temp_path / 'a' / 'test_bar.png']
+        cache = ImageInfoCache(cache_path)
+        first = list(inspect_images(paths, workers=2, cache=cache))
+        assert_equal(2, len(cache))
+        cache.save()
+        cache = ImageInfoCache(cache_path)
+        stat = os.stat(paths[0])
+        assert_equal(first[0][1], cache.get(paths[0], stat))
+        assert_equal(first, list(inspect_images(paths, cache=cache)))
+        os.utime(paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        assert_equal(None, cache.get(paths[0], os.stat(paths[0])))
+        cache.entries[os.path.abspath(paths[1])][2][1] = 1
+        assert_equal(1, list(inspect_images(paths[1:], cache=cache))[0][1][1])
+
+    def test_unreadable(self):
+        """Images: files that can't be inspected don't stop the others"""
+        paths = [
+            temp_path / 'test_foo.jpg', temp_path / 'a' / 'b' / 'notes.txt',
+            temp_path / 'missing.jpg', temp_path / 'a' / 'test_bar.png']
+        cache = ImageInfoCache()
+        results = list(inspect_images(paths, workers=2, cache=cache))
+        assert_equal(paths, [path for path, info in results])
+        assert_equal(
+            ['jpeg', None, None, 'png'],
+            [None if info is None else info.format for path, info in results])
+        assert_equal(2, len(cache))
+
+    def test_collection(self):
+        """Images: collections inspect the images they were given"""
+        oc = ObjectCollection()
+        for obj_id in ['foo', 'bar', 'baz']:
+            oc.add({'id': obj_id, 'title': obj_id})
+        oc.add_images(temp_path, None, fail_on_mismatch=False, recursive=True)
+        oc.objects['baz'].data['image'] = None
+        oc.add({'id': 'pickle', 'title': 'pickle'})
+        oc.objects['pickle'].data['image'] = 'a/b/test_pickle.jpg'
+        cache = ImageInfoCache()
+        info = oc.inspect_images(temp_path, workers=2, cache=cache)
+        assert_equal(['bar', 'foo'], sorted(info))
+        assert_equal(2, len(cache))
+        assert_equal((640, 480), info['bar'][1:3])
+        assert_false('baz' in info)
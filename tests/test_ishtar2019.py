@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 """Test exhibitor for ishtar 2019"""
 
-from exhibitor.ishtar2019 import IshtarCollection, ISHTAR_CROSSWALK
+from exhibitor.ishtar2019 import (
+    IshtarCollection, ISHTAR_CROSSWALK, ISHTAR_SUMMARY_TEMPLATE)
+from exhibitor.objects import ObjectData
 import logging
 from nose.tools import assert_equal, assert_false, assert_true, raises
 from os.path import abspath, join, realpath
@@ -47,3 +49,77 @@ class Test_Ishtar(TestCase):
         bf = ic.objects[brick_frags[0]]
         assert_equal('Brick fragment', bf.data['title'])
         assert_true(bf.data['inventory_num'].startswith('VA 17462; VA 17479'))
+
+    def test_fix_titles(self):
+        """IshtarCollection: title fixups apply and report drift"""
+        ic = IshtarCollection()
+        ic.load(test_data_path / 'ishtar_2019-08-21.csv', merge=True)
+        report = ic.fix_titles()
+        assert_equal([], report.drift)
+        assert_true('100' in report.applied)
+        bowl = ic.objects['100'].data
+        assert_equal('Bowl with Bulls', bowl['title'])
+        assert_equal('Bowl with procession of bulls', bowl['title_detail'])
+        ic = IshtarCollection()
+        ic.load(test_data_path / 'ishtar_2019-08-21.csv', merge=True)
+        ic.objects['1'].data['title'] = 'Crate'
+        report = ic.fix_titles()
+        assert_equal(['1'], report.drifted_ids())
+        assert_equal('Crate', ic.objects['1'].data['title'])
+
+    def test_summary_template(self):
+        """IshtarCollection: summaries of the special kinds of object"""
+        cases = [
+            (
+                {
+                    'id': 'x1', 'title': 'Illustration',
+                    'full_title': 'Partial reconstruction of palace wall',
+                    'medium': 'Watercolor on paper', 'artist': 'Walter Andrae',
+                    'lender': 'The Society', 'inventory_num': 'D 1'},
+                'Watercolor illustration of a partial reconstruction of '
+                'palace wall by Walter Andrae. Lent by The Society '
+                '(inventory number: D 1). On view.'),
+            (
+                {
+                    'id': 'x2', 'title': 'Excavation Photograph',
+                    'full_title': 'Portion of a wall found in situ',
+                    'artist': 'Photographer unknown',
+                    'object_location': 'Babylon, Iraq',
+                    'lender': 'The Museum'},
+                'Excavation Photograph: portion of a wall found in situ, '
+                'from Babylon, Iraq. Lent by The Museum. On view.'),
+            (
+                {
+                    'id': 'x3', 'title': 'Ingot', 'medium': 'Glass',
+                    'object_location': 'Said to be from Babylon',
+                    'lender': 'The Museum', 'inventory_num': 'unknown'},
+                'Glass ingot, said to be from Babylon. Lent by The Museum. '
+                'On view.'),
+            (
+                {
+                    'id': 'x4', 'title': 'Cylinder Seal',
+                    'title_detail': 'Cylinder Seal with a contest scene',
+                    'full_title': 'Cylinder Seal',
+                    'object_location': 'Probably Uruk',
+                    'lender': 'The Library', 'inventory_num': 'S 3'},
+                'Cylinder Seal with a contest scene, probably from Uruk. '
+                'Lent by The Library (inventory number: S 3). On view.'),
+            (
+                {'id': '124', 'title': 'Samples', 'lender': 'Someone'},
+                'Samples of stones and metals. Lent by Mineralogical and '
+                'Geological Museum, Harvard University (inventory numbers: '
+                '109163; 132691; 132621; 88805; 128750; 99501; 83164; '
+                '96791; 81490; 112538; 121347; 95355; 99713; 81536). '
+                'On view.')
+        ]
+        for data, expected in cases:
+            assert_equal(
+                expected,
+                ISHTAR_SUMMARY_TEMPLATE.render(ObjectData(data), 'On view.'))
+
+    @raises(RuntimeError)
+    def test_summary_untrapped_illustration(self):
+        """IshtarCollection: illustrations need a known medium"""
+        ISHTAR_SUMMARY_TEMPLATE.render(ObjectData({
+            'id': 'x1', 'title': 'Illustration', 'medium': 'Oil on canvas',
+            'lender': 'The Society'}))
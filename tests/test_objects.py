@@ -3,7 +3,12 @@
 """Test Exhibitor objects module"""
 
 from contextlib import contextmanager
-from exhibitor.objects import ExhibitionObject, ObjectCollection
+from encoded_csv import get_csv
+from copy import deepcopy
+from exhibitor.objects import (
+    CrosswalkPlan, ExhibitionObject, ObjectCollection, ObjectData,
+    field_schema, guess_file_type, iter_csv, iter_dump, iter_json)
+from inspect import isgenerator
 from io import StringIO
 import json
 import logging
@@ -21,20 +26,22 @@ test_data_path = Path() / 'tests' / 'data'
 
 def setup_module():
     """Change me"""
-    temp_path = test_data_path / 'out_raw_object_data.json'
-    try:
-        temp_path.unlink()
-    except FileNotFoundError:
-        pass
+    for suffix in ['json', 'msgpack', 'csv']:
+        temp_path = test_data_path / 'out_raw_object_data.{}'.format(suffix)
+        try:
+            temp_path.unlink()
+        except FileNotFoundError:
+            pass
 
 
 def teardown_module():
     """Change me"""
-    temp_path = test_data_path / 'out_raw_object_data.json'
-    try:
-        temp_path.unlink()
-    except FileNotFoundError:
-        pass
+    for suffix in ['json', 'msgpack', 'csv']:
+        temp_path = test_data_path / 'out_raw_object_data.{}'.format(suffix)
+        try:
+            temp_path.unlink()
+        except FileNotFoundError:
+            pass
 
 
 @contextmanager
@@ -146,6 +153,204 @@ class Test_Collection(TestCase):
         oc.load(path)
         assert_equal(3, len(oc.objects))
 
+    def test_indices(self):
+        """Collection: field indices follow adds, merges and edits"""
+        oc = ObjectCollection()
+        oc.add({'id': 'foo', 'title': 'Foo', 'lender': 'Museum'})
+        assert_equal(['foo'], oc.get_by_title('Foo'))
+        oc.add({'id': 'bar', 'title': 'Bar', 'lender': 'museum'})
+        assert_equal(['foo'], oc.get_by('lender', 'Museum'))
+        assert_equal(
+            ['foo', 'bar'], oc.get_by('lender', 'MUSEUM', casefold=True))
+        oc.objects['bar'].data['title'] = 'Baz'
+        assert_equal([], oc.get_by_title('Bar'))
+        assert_equal(['bar'], oc.get_by_title('baz', casefold=True))
+        oc.add({'id': 'bar', 'title': 'Baz', 'lender': 'Library'}, merge=True)
+        assert_equal(['foo'], oc.get_by('lender', 'museum', casefold=True))
+        assert_equal(['bar'], oc.get_by('lender', 'museum; Library'))
+        assert_equal([], oc.get_by('slug', 'foo'))
+        oc.objects['foo'].data['slug'] = 'foo'
+        assert_equal(['foo'], oc.get_by('slug', 'foo'))
+
+    def test_indices_unhashable(self):
+        """Collection: unhashable values are stored but not indexed"""
+        oc = ObjectCollection()
+        oc.add({'id': 'foo', 'title': 'Foo', 'lender': 'L'})
+        oc.objects['foo'].data['lender'] = ['a', 'b']
+        assert_equal(['a', 'b'], oc.objects['foo'].data['lender'])
+        assert_equal([], oc.get_by('lender', 'L'))
+        oc.objects['foo'].data['lender'] = 'M'
+        assert_equal(['foo'], oc.get_by('lender', 'M'))
+        oc.add(
+            {'id': 'bar', 'title': 'Bar', 'lender': ('L', ['M'])},
+            clean=False)
+        assert_equal(['foo'], oc.get_by('lender', 'm', casefold=True))
+
+    def test_indices_id_change(self):
+        """Collection: changing an object's id moves it and its entries"""
+        oc = ObjectCollection()
+        oc.add_index('id')
+        oc.add({'id': 'foo', 'title': 'Foo', 'lender': 'Museum'})
+        oc.add({'id': 'bar', 'title': 'Bar'})
+        obj = oc.objects['foo']
+        obj.data['id'] = 'baz'
+        assert_equal(['bar', 'baz'], sorted(oc.objects))
+        assert_true(oc.objects['baz'] is obj)
+        assert_equal(['baz'], oc.get_by_title('Foo'))
+        assert_equal(['baz'], oc.get_by('id', 'baz'))
+        assert_equal([], oc.get_by('id', 'foo'))
+        obj.data['lender'] = 'Library'
+        assert_equal([], oc.get_by('lender', 'Museum'))
+        assert_equal(['baz'], oc.get_by('lender', 'Library'))
+
+    @raises(RuntimeError)
+    def test_indices_id_collision(self):
+        """Collection: an object can't take the id of another"""
+        oc = ObjectCollection()
+        oc.add({'id': 'foo', 'title': 'Foo'})
+        oc.add({'id': 'bar', 'title': 'Bar'})
+        oc.objects['foo'].data['id'] = 'bar'
+
+    def test_remove(self):
+        """Collection: removing an object drops its index entries"""
+        oc = ObjectCollection()
+        oc.add({'id': 'foo', 'title': 'Foo', 'lender': 'Museum'})
+        oc.add({'id': 'bar', 'title': 'Bar', 'lender': 'Museum'})
+        obj = oc.remove('foo')
+        assert_equal(['bar'], list(oc.objects))
+        assert_equal([], oc.get_by_title('Foo'))
+        assert_equal(['bar'], oc.get_by('lender', 'Museum'))
+        obj.data['title'] = 'Bar'
+        assert_equal(['bar'], oc.get_by_title('Bar'))
+        oc.add(obj)
+        assert_equal(['bar', 'foo'], oc.get_by_title('Bar'))
+
+    def test_add_other_collection(self):
+        """Collection: objects of another collection are copied"""
+        oc = ObjectCollection()
+        oc.add({'id': 'foo', 'title': 'Foo'})
+        other = ObjectCollection()
+        other.add(oc.objects['foo'])
+        assert_false(other.objects['foo'] is oc.objects['foo'])
+        other.objects['foo'].data['title'] = 'Bar'
+        assert_equal(['foo'], oc.get_by_title('Foo'))
+        assert_equal(['foo'], other.get_by_title('Bar'))
+
+    def test_add_index(self):
+        """Collection: index an arbitrary field on demand"""
+        oc = ObjectCollection()
+        oc.add({'id': 'foo', 'title': 'Foo', 'medium': 'Clay'})
+        assert_false('medium' in oc.indices)
+        assert_equal(['foo'], oc.get_by('medium', 'clay', casefold=True))
+        assert_true('medium' in oc.indices)
+        oc.objects['foo'].data['medium'] = 'Wood'
+        assert_equal(['foo'], oc.get_by('medium', 'Wood'))
+
+    def test_iter_csv(self):
+        """Collection: lazily read rows from csv"""
+        path = test_data_path / 'ishtar_2019-08-21.csv'
+        rows = iter_csv(path, sample_lines=1000)
+        assert_true(isgenerator(rows))
+        assert_equal(
+            get_csv(path, sample_lines=1000)['content'], list(rows))
+
+    def test_load_blank_lines(self):
+        """Collection: blank lines in csv are not objects"""
+        path = test_data_path / 'out_raw_object_data.csv'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(
+                'id,title,inventory_num\r\na,A,1\r\n\r\nb,B,2\r\n\r\n')
+        assert_equal(
+            [['id', 'title', 'inventory_num'], ['a', 'A', '1'],
+             ['b', 'B', '2']],
+            list(iter_csv(path, positional=True)))
+        for workers in [None, 2]:
+            oc = ObjectCollection()
+            oc.load(path, workers=workers)
+            assert_equal(['a', 'b'], sorted(oc.objects))
+
+    def test_apply_fixups(self):
+        """Collection: fixup tables join against object ids"""
+        oc = ObjectCollection()
+        oc.add({'id': 'a', 'title': 'Bowl'})
+        oc.add({'id': 'b', 'title': 'Jar'})
+        report = oc.apply_fixups({
+            'a': {'was': 'Bowl', 'title': 'Dish', 'full_title': 'was',
+                  'title_detail': None},
+            'b': {'was': 'Vase', 'title': 'Urn'},
+            'c': {'was': 'Cup', 'title': 'Mug'}
+        }, expect={'title': 'was'})
+        assert_equal(['a'], report.applied)
+        assert_equal([('b', 'title', 'Vase', 'Jar')], report.drift)
+        assert_equal(['c'], report.unmatched)
+        assert_equal('Dish', oc.objects['a'].data['title'])
+        assert_equal('Bowl', oc.objects['a'].data['full_title'])
+        assert_equal(None, oc.objects['a'].data['title_detail'])
+        assert_equal('Jar', oc.objects['b'].data['title'])
+        assert_equal(['a'], oc.get_by_title('Dish'))
+        report = oc.apply_fixups({'b': 'jar-1'}, field='slug')
+        assert_equal(['b'], report.applied)
+        assert_equal('jar-1', oc.objects['b'].data['slug'])
+
+    def test_compile_crosswalk(self):
+        """Collection: crosswalk is compiled once per header"""
+        oc = ObjectCollection(crosswalk={'Name': 'title', 'Ref': 'id'})
+        plan = oc.compile_crosswalk(['Ref', 'Name'])
+        assert_true(plan is oc.compile_crosswalk(('Ref', 'Name')))
+        assert_equal(None, plan.id_position)
+        o = ExhibitionObject.from_row([' foo', 'Foo  bar'], plan)
+        assert_equal('foo', o.data['id'])
+        assert_equal('Foo bar', o.data['title'])
+
+    @raises(ValueError)
+    def test_compile_crosswalk_unknown(self):
+        """Collection: reject headers the crosswalk doesn't cover"""
+        CrosswalkPlan(['id', 'title', 'colour'])
+
+    def test_from_row(self):
+        """Object: positional rows match dictionary rows"""
+        path = test_data_path / 'raw_object_data.csv'
+        rows = iter_csv(path, positional=True)
+        plan = CrosswalkPlan(next(rows))
+        for row, datum in zip(rows, iter_csv(path)):
+            assert_equal(
+                ExhibitionObject(datum).data,
+                ExhibitionObject.from_row(row, plan).data)
+
+    def test_iter_json(self):
+        """Collection: lazily read members of a JSON object"""
+        path = test_data_path / 'out_raw_object_data.json'
+        oc = ObjectCollection()
+        oc.load(test_data_path / 'raw_object_data.csv')
+        oc.dump(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            expected = list(json.load(f).items())
+        for chunk_size in [1, 5, 65536]:
+            pairs = iter_json(path, chunk_size=chunk_size)
+            assert_true(isgenerator(pairs))
+            assert_equal(expected, list(pairs))
+        oc2 = ObjectCollection()
+        oc2.load(path, file_type='json')
+        assert_equal(oc._make_dump_dict(), oc2._make_dump_dict())
+
+    def test_iter_json_numbers(self):
+        """Collection: numbers split across chunks are read whole"""
+        path = test_data_path / 'out_raw_object_data.json'
+        members = {
+            'a': 12.5, 'b': 'x', 'c': -3e-7, 'd': 1E+10, 'e': [0.25, -1],
+            'f': 123456789}
+        for text in [
+            '{"a": 12.5, "b": "x"}',
+            json.dumps(members),
+            json.dumps(members, indent=4)
+        ]:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            expected = list(json.loads(text).items())
+            for chunk_size in [1, 2, 3, 5, 9, 65536]:
+                assert_equal(
+                    expected, list(iter_json(path, chunk_size=chunk_size)))
+
     @raises(NotImplementedError)
     def test_load_rtf(self):
         """Collection: reject loading rtf from file"""
@@ -213,6 +418,45 @@ class Test_Collection(TestCase):
         for k, v in j.items():
             assert_equal(v, oc.objects[k].data)
 
+    def test_dump_json_identical(self):
+        """Collection: streamed JSON matches json.dump output exactly"""
+        oc = ObjectCollection()
+        oc.load(test_data_path / 'raw_object_data.csv')
+        oc.objects['foo'].data['notes'] = 'Ünïcode\n"quoted"'
+        oc.objects['foo'].data['original_title'] = 'Foo'
+        with captured_output() as (out, err):
+            oc.dump()
+        expected = json.dumps(
+            oc._make_dump_dict(), ensure_ascii=False, indent=4,
+            sort_keys=True)
+        assert_equal(expected + '\n', out.getvalue())
+        oc = ObjectCollection()
+        with captured_output() as (out, err):
+            oc.dump()
+        assert_equal('{}\n', out.getvalue())
+
+    def test_msgpack(self):
+        """Collection: round trip through msgpack"""
+        path = test_data_path / 'raw_object_data.csv'
+        oc = ObjectCollection()
+        oc.load(path)
+        oc.objects['foo'].data['original_title'] = 'Foo'
+        dest = test_data_path / 'out_raw_object_data.msgpack'
+        assert_equal('msgpack', guess_file_type(dest))
+        oc.dump(dest, file_type='msgpack')
+        oc2 = ObjectCollection()
+        oc2.load(dest, file_type='msgpack')
+        assert_equal(oc._make_dump_dict(), oc2._make_dump_dict())
+        assert_equal(oc._make_dump_dict(), dict(iter_dump(dest)))
+
+    @raises(ValueError)
+    def test_msgpack_not_ours(self):
+        """Collection: reject msgpack files without our header"""
+        path = test_data_path / 'out_raw_object_data.msgpack'
+        with open(path, 'wb') as f:
+            f.write(b'\x91\x01')
+        ObjectCollection().load(path, file_type='msgpack')
+
     @raises(NotImplementedError)
     def test_dump_bad_type(self):
         """Collection: test dumping to unsupported type"""
@@ -261,6 +505,34 @@ class Test_Collection(TestCase):
             'This is an image of a motorcycle in the shape of a pickle.'
             in walt)
 
+    def test_alt_text_report(self):
+        """Collection: alt text problems are reported together"""
+        path = test_data_path / 'raw_object_data.csv'
+        oc = ObjectCollection()
+        oc.load(path)
+        oc.add({'id': 'extra', 'title': 'Extra'})
+        oc.objects['extra'].data['image'] = 'test_extra.jpg'
+        oc.remove('pickle')
+        report = oc._add_alt_text(
+            test_data_path / 'raw_object_alt_text.csv',
+            fail_on_image_missing=False,
+            fail_on_mismatch=False
+        )
+        assert_equal(['foo', 'bar'], report.applied)
+        assert_equal(['pickle'], report.unmatched)
+        assert_equal(['foo', 'bar'], report.no_image)
+        assert_equal(['extra'], report.missing_alt)
+
+    @raises(RuntimeError)
+    def test_alt_text_mismatch(self):
+        """Collection: unmatched alt text fails once, after the join"""
+        oc = ObjectCollection()
+        oc.add({'id': 'foo', 'title': 'Foo'})
+        oc._add_alt_text(
+            test_data_path / 'raw_object_alt_text.csv',
+            fail_on_image_missing=False
+        )
+
 
 class Test_Object(TestCase):
 
@@ -370,3 +642,56 @@ class Test_Object(TestCase):
         o2 = ExhibitionObject(d2)
         o3 = o1.merge(o2)
         assert_true(uuid.UUID(o3.data['id'], version=4))
+
+
+class Test_ObjectData(TestCase):
+
+    def test_schema(self):
+        """ObjectData: all schema fields present and unset"""
+        d = ObjectData()
+        assert_equal(list(field_schema), list(d.keys()))
+        assert_equal(len(set(field_schema)), len(d))
+        for v in d.values():
+            assert_equal(None, v)
+
+    def test_dict_compatible(self):
+        """ObjectData: behaves like the dict it replaces"""
+        d = ObjectData({'title': 'Foo', 'slug': 'foo'})
+        plain = {k: None for k in field_schema}
+        plain.update({'title': 'Foo', 'slug': 'foo'})
+        assert_equal(plain, d)
+        assert_equal(plain, dict(d))
+        assert_equal(json.dumps(plain), json.dumps(dict(d)))
+        d['title'] = 'Bar'
+        assert_equal('Bar', d['title'])
+        del d['title']
+        assert_true('title' in d)
+        assert_equal(None, d['title'])
+
+    def test_extra_keys(self):
+        """ObjectData: keys outside the schema are kept"""
+        d = ObjectData()
+        try:
+            d['original_title']
+        except KeyError:
+            pass
+        else:
+            raise AssertionError('expected KeyError')
+        d['original_title'] = 'Foo'
+        assert_equal('Foo', d['original_title'])
+        assert_equal(len(field_schema) + 1, len(d))
+        del d['original_title']
+        assert_false('original_title' in d)
+
+    def test_copy(self):
+        """ObjectData: deep copies are independent"""
+        d = ObjectData({'title': 'Foo'})
+        dd = deepcopy(d)
+        dd['title'] = 'Bar'
+        assert_equal('Foo', d['title'])
+
+    @raises(AttributeError)
+    def test_object_slots(self):
+        """Object: no per-instance attribute dict"""
+        o = ExhibitionObject({'id': 'foo', 'title': 'Foo'})
+        o.foo = 'bar'
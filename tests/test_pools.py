@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor pools module"""
+
+from exhibitor.pools import run_in_pool
+from functools import partial
+import logging
+from nose.tools import assert_equal, raises
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+# set in each worker process by init_worker
+offset = 0
+
+
+def init_worker(value):
+    global offset
+    offset = value
+
+
+def add_offset(job, scale=1):
+    return (job + offset) * scale
+
+
+def fail_on_three(job):
+    if job == 3:
+        raise ValueError(job)
+    return job
+
+
+class Test_Pools(TestCase):
+
+    def test_order(self):
+        """Pools: results come back in job order"""
+        jobs = iter(range(50))
+        assert_equal(
+            [2 * (j + 10) for j in range(50)],
+            list(run_in_pool(
+                partial(add_offset, scale=2), jobs, 3,
+                initializer=init_worker, initargs=(10,))))
+
+    @raises(ValueError)
+    def test_error(self):
+        """Pools: an error in a job is raised to the consumer"""
+        list(run_in_pool(fail_on_three, range(10), 2))
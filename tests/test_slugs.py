@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor slugs module"""
+
+from exhibitor.objects import ObjectCollection
+from exhibitor.slugs import SlugAllocator, SlugRules, slug_suffix
+import logging
+from nose.tools import assert_equal, assert_false, assert_true, raises
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+
+
+class Test_SlugRules(TestCase):
+
+    def test_default_rules(self):
+        """Slugs: default rules truncate and drop first stop words"""
+        rules = SlugRules()
+        for title, slug in [
+            ('Bowl of Bulls: with of', 'bowl-bulls'),
+            (' (Foo) bar', ''),
+            ('Tablet with text from Uruk, with seal', 'tablet-text-uruk'),
+            ('Façade of the Gate. Detail', 'facade-the-gate'),
+            ('Head from from Ur', 'head-from-ur'),
+            ('Ishtar  Gate;  reconstruction', 'ishtar-gate')
+        ]:
+            assert_equal(slug, rules.make(title))
+
+    def test_custom_rules(self):
+        """Slugs: collections can bring their own rules"""
+        class TheCollection(ObjectCollection):
+            slug_rules = SlugRules(truncate_at='/', stop_words=['the'])
+        oc = TheCollection()
+        oc.add({'id': 'foo', 'title': 'The Gate: the Lion/Bull'})
+        oc.make_slugs()
+        assert_equal('the-gate-lion', oc.objects['foo'].data['slug'])
+
+
+class Test_SlugAllocator(TestCase):
+
+    def test_suffix(self):
+        """Slugs: suffixes go past z"""
+        assert_equal(
+            ['a', 'b', 'z', 'aa', 'az', 'ba', 'zz', 'aaa'],
+            [slug_suffix(n) for n in [1, 2, 26, 27, 52, 53, 702, 703]])
+
+    def test_allocate(self):
+        """Slugs: repeats get suffixes that skip taken slugs"""
+        allocator = SlugAllocator()
+        assert_equal('brick-a', allocator.allocate('brick-a'))
+        assert_equal('brick', allocator.allocate('brick'))
+        assert_equal('brick-b', allocator.allocate('brick'))
+        assert_equal('brick-c', allocator.allocate('brick'))
+        for n in range(30):
+            allocator.allocate('brick')
+        assert_equal(34, len(allocator))
+        assert_true('brick-ag' in allocator)
+
+    def test_make_slugs(self):
+        """Slugs: fixed slugs are reserved and re-runs are stable"""
+        class FixedCollection(ObjectCollection):
+            def _set_slug(self, obj_id):
+                return {'z': 'brick'}.get(obj_id)
+        oc = FixedCollection()
+        for obj_id in ['a', 'b', 'c', 'z']:
+            oc.add({'id': obj_id, 'title': 'Brick'})
+        for run in range(2):
+            oc.make_slugs()
+            assert_equal(
+                ['brick-a', 'brick-b', 'brick-c', 'brick'],
+                [o.data['slug'] for o in oc.objects.values()])
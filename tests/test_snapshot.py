@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor snapshot module"""
+
+from exhibitor.ishtar2019 import IshtarCollection
+from exhibitor.objects import ObjectCollection, iter_dump
+from exhibitor.snapshot import ColumnarSnapshot, write_snapshot
+import logging
+from nose.tools import assert_equal, assert_false, assert_true, raises
+from pathlib import Path
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+test_data_path = Path() / 'tests' / 'data'
+temp_path = test_data_path / 'out_collection.snapshot'
+
+
+def setup_module():
+    try:
+        temp_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def teardown_module():
+    try:
+        temp_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class Test_Snapshot(TestCase):
+
+    def test_columns(self):
+        """Snapshot: read values, columns and ids without loading"""
+        write_snapshot(
+            temp_path, ['id', 'title', 'notes'],
+            [('a', 'Ä', None), ('b', '', 'n'), ('c', 'Cé', None)])
+        with ColumnarSnapshot(temp_path) as snapshot:
+            assert_equal(3, len(snapshot))
+            assert_equal(['a', 'b', 'c'], list(snapshot.ids()))
+            assert_equal(['Ä', '', 'Cé'], list(snapshot.column('title')))
+            assert_equal(
+                {'id': 'c', 'title': 'Cé', 'notes': None}, snapshot['c'])
+            assert_equal('n', snapshot.get('b', 'notes'))
+            assert_true('a' in snapshot)
+            assert_false('bb' in snapshot)
+            assert_equal(None, snapshot.get('z', 'title'))
+
+    @raises(ValueError)
+    def test_unsorted(self):
+        """Snapshot: rows must be in id order"""
+        write_snapshot(temp_path, ['id'], [('b',), ('a',)])
+
+    @raises(ValueError)
+    def test_not_a_snapshot(self):
+        """Snapshot: reject other files"""
+        ColumnarSnapshot(test_data_path / 'raw_object_data.csv')
+
+    def test_collection(self):
+        """Snapshot: dump and load a collection"""
+        ic = IshtarCollection()
+        ic.load(test_data_path / 'ishtar_2019-08-21.csv', merge=True)
+        ic.objects['1'].data['original_title'] = 'Crate'
+        ic.dump(temp_path, file_type='snapshot')
+        with ColumnarSnapshot(temp_path) as snapshot:
+            assert_equal(len(ic), len(snapshot))
+            for obj_id, obj in ic.objects.items():
+                assert_equal(obj.data['title'], snapshot.get(obj_id, 'title'))
+        oc = ObjectCollection()
+        oc.load(temp_path, file_type='snapshot')
+        assert_equal(ic._make_dump_dict(), oc._make_dump_dict())
+        assert_equal(len(ic), len(list(iter_dump(temp_path))))
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor spelling module"""
+
+from exhibitor.ishtar2019 import IshtarCollection
+from exhibitor.objects import ObjectCollection
+from exhibitor.spelling import (
+    SpellChecker, SpellingCache, SuggestionIndex, edit_distance,
+    format_report, tokenize)
+import logging
+from nose.tools import assert_equal, assert_false, assert_true, raises
+from pathlib import Path
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+test_data_path = Path() / 'tests' / 'data'
+words_path = Path() / 'data' / 'spelling.txt'
+cache_path = test_data_path / 'out_spelling_cache.json'
+
+
+def setup_module():
+    try:
+        cache_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def teardown_module():
+    try:
+        cache_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class Test_Spelling(TestCase):
+
+    def setUp(self):
+        self.checker = SpellChecker(
+            ['what', 'about', 'i', 'just', 'want', 'to', 'ride', 'my',
+             'a', 'don\'t'],
+            permitted=['foo'])
+
+    def test_tokenize(self):
+        """Spelling: split at whitespace and punctuation"""
+        assert_equal(
+            ['Foo', 'bar', 'baz', '12', 'qux', 'x'],
+            tokenize('Foo (bar)–baz,\n12; "qux" © x'))
+
+    def test_check_value(self):
+        """Spelling: unknown words are lower-cased; numbers pass"""
+        assert_equal(
+            ['bar?', 'pickle'],
+            self.checker.check_value('What about Bar? I want a pickle 12'))
+        assert_equal([], self.checker.check_value('foo 3a 007 b12 1234'))
+
+    def test_check_collection(self):
+        """Spelling: loci of unknown words across a collection"""
+        oc = ObjectCollection()
+        oc.load(test_data_path / 'raw_object_data.csv')
+        words = self.checker.check_collection(oc)
+        assert_equal([('bar', 'title')], words['bar'][:1])
+        assert_false('foo' in words)
+        assert_true('pickle!' in words)
+        lines = list(
+            format_report(words, lambda oid, k: oc.objects[oid].data[k]))
+        assert_equal('bar', lines[0])
+        assert_equal('\tbar[title]: Bar', lines[1])
+
+    def test_parallel(self):
+        """Spelling: parallel check merges to the serial result"""
+        oc = IshtarCollection()
+        oc.load(test_data_path / 'ishtar_2019-08-21.csv', merge=True)
+        checker = SpellChecker(['of', 'the'])
+        serial = checker.check_collection(oc)
+        parallel = checker.check_collection(oc, workers=2, batch_size=9)
+        assert_equal(serial, parallel)
+        assert_equal(list(serial.items()), list(parallel.items()))
+
+    def test_edit_distance(self):
+        """Spelling: edit distance counts adjacent transpositions once"""
+        assert_equal(0, edit_distance('brick', 'brick'))
+        assert_equal(1, edit_distance('brick', 'brikc'))
+        assert_equal(1, edit_distance('brick', 'bricks'))
+        assert_equal(2, edit_distance('brick', 'rbikc'))
+        assert_equal(3, edit_distance('', 'abc'))
+
+    def test_suggest(self):
+        """Spelling: suggest close dictionary words, nearest first"""
+        index = SuggestionIndex(['museum', 'muse', 'museums', 'babylon'])
+        assert_equal(['museum', 'museums'], index.suggest('mnseum'))
+        assert_equal(['museum'], index.suggest('mnseum', count=1))
+        assert_equal([], index.suggest('nineveh'))
+        checker = SpellChecker(['museum'], permitted=['babylon'])
+        assert_equal(['babylon'], checker.suggest('babylom'))
+        lines = list(format_report(
+            {'babylom': [('a', 'title')]}, lambda oid, k: 'Babylom',
+            checker.suggest))
+        assert_equal('babylom (suggestions: babylon)', lines[0])
+
+    def test_cache(self):
+        """Spelling: cached re-runs only check what changed"""
+        items = {
+            'a': {'title': 'Foo bar', 'notes': 'Qux'},
+            'b': {'title': 'Bar baz', 'notes': None}
+        }
+        checker = SpellChecker(['foo', 'baz'])
+        cache = SpellingCache(cache_path)
+        words = checker.check_items(items.items(), cache=cache)
+        assert_equal(checker.check_items(items.items()), words)
+        cache.save()
+        cache = SpellingCache(cache_path)
+        assert_equal(3, len(cache))
+        # unchanged values are not checked again
+        checker.classify_value = None
+        assert_equal(words, checker.check_items(items.items(), cache=cache))
+        # a word added to the dictionary is dropped from cached results
+        checker = SpellChecker(['foo', 'baz', 'bar'])
+        checker.classify_value = None
+        assert_equal(
+            {'qux': [('a', 'notes')]},
+            checker.check_items(items.items(), cache=cache))
+        # a removed word forces a recheck of the values that had it
+        checker = SpellChecker(['foo', 'bar'])
+        items['a']['notes'] = 'Foo'
+        assert_equal(
+            {'baz': [('b', 'title')]},
+            checker.check_items(items.items(), cache=cache))
+        assert_equal(
+            checker.check_items(items.items()),
+            checker.check_items(items.items(), cache=cache, workers=2))
+
+    def test_from_file(self):
+        """Spelling: load dictionary from a file"""
+        checker = SpellChecker.from_file(words_path)
+        assert_true(checker.is_known('babylon'))
+        assert_false(checker.is_known('babylonx'))
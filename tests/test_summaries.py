@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test exhibitor summaries module"""
+
+from exhibitor.objects import ObjectCollection
+from exhibitor.summaries import (
+    SummaryTemplate, choose, compose, fail, field_is, first, text)
+import logging
+from nose.tools import assert_equal, raises
+from unittest import TestCase
+
+logger = logging.getLogger(__name__)
+
+
+def make_collection():
+    oc = ObjectCollection()
+    oc.add({
+        'id': 'bowl', 'title': 'Bowl', 'artist': 'Artist unknown',
+        'object_location': 'Ur', 'lender': 'The Museum',
+        'inventory_num': 'B 12'})
+    oc.add({
+        'id': 'seal', 'title': 'Seal', 'full_title': 'Seal with lion',
+        'lender': 'The Library', 'inventory_num': 'N/A'})
+    return oc
+
+
+class Test_Parts(TestCase):
+
+    def test_compose(self):
+        """Summaries: compose fills fields and gives nothing for None"""
+        part = compose('{a} and {b}', b=lambda data: data['c'].upper())
+        assert_equal('x and Y', part({'a': 'x', 'c': 'y'}))
+        assert_equal(None, part({'a': None, 'c': 'y'}))
+
+    def test_first_and_choose(self):
+        """Summaries: first and choose pick one part"""
+        part = choose(
+            (field_is('kind', 'a', 'b'), text('ab')),
+            default=first(compose('{x}'), text('none')))
+        assert_equal('ab', part({'kind': 'b', 'x': None}))
+        assert_equal('x', part({'kind': 'c', 'x': 'x'}))
+        assert_equal('none', part({'kind': 'c', 'x': None}))
+
+    @raises(RuntimeError)
+    def test_fail(self):
+        """Summaries: fail raises with the object's data"""
+        fail('Object {id} is broken')({'id': 'foo'})
+
+
+class Test_SummaryTemplate(TestCase):
+
+    def test_default_template(self):
+        """Summaries: default template covers title, place and lender"""
+        oc = make_collection()
+        oc.make_summaries('On view.')
+        assert_equal(
+            'Bowl from Ur. Lent by The Museum (inventory number: B 12). '
+            'On view.',
+            oc.objects['bowl'].data['summary'])
+        assert_equal(
+            'Seal with lion. Lent by The Library. On view.',
+            oc.objects['seal'].data['summary'])
+
+    def test_default_template_no_lender(self):
+        """Summaries: default template without a lender"""
+        oc = ObjectCollection()
+        oc.add({'id': 'foo', 'title': 'Foo'})
+        oc.make_summaries()
+        assert_equal('Foo.', oc.objects['foo'].data['summary'])
+        oc.make_summaries('Blurb.')
+        assert_equal('Foo. Blurb.', oc.objects['foo'].data['summary'])
+
+    def test_lead_and_overrides(self):
+        """Summaries: lead lower-cases what follows; overrides win"""
+        template = SummaryTemplate(
+            [compose('{title}'), text(', lent')],
+            lead=choose((field_is('id', 'bowl'), text('A '))),
+            overrides={'seal': 'Special.'})
+        oc = make_collection()
+        assert_equal(
+            [('bowl', 'A bowl, lent. Blurb.'), ('seal', 'Special. Blurb.')],
+            list(template.render_all(oc.objects.items(), 'Blurb.')))
+
+    def test_collection_template(self):
+        """Summaries: collections can bring their own template"""
+        class TitleCollection(ObjectCollection):
+            summary_template = SummaryTemplate([compose('{title}')])
+        oc = TitleCollection()
+        oc.add({'id': 'foo', 'title': 'Foo'})
+        oc.make_summaries()
+        assert_equal('Foo.', oc.objects['foo'].data['summary'])
+
+    def test_set_summary_override(self):
+        """Summaries: collections can override _set_summary"""
+        class ShoutingCollection(ObjectCollection):
+            def _set_summary(self, obj, exhibition_blurb):
+                return ObjectCollection._set_summary(
+                    self, obj, exhibition_blurb).upper()
+        oc = ShoutingCollection()
+        oc.add({'id': 'foo', 'title': 'Foo', 'lender': 'Bar'})
+        oc.make_summaries()
+        assert_equal('FOO. LENT BY BAR.', oc.objects['foo'].data['summary'])